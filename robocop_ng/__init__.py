@@ -1,10 +1,11 @@
 import os
+import re
 import sys
 import logging
 import logging.handlers
 import traceback
-import aiohttp
 import config
+from helpers.storage import get_storage
 
 import discord
 from discord.ext import commands
@@ -61,6 +62,25 @@ bot.log = log
 bot.config = config
 bot.script_name = script_name
 bot.wanted_jsons = wanted_jsons
+# Messages dropped before building a context vs ones handed to the command handler
+bot.dispatch_stats = {"fast_path": 0, "dispatched": 0}
+
+# Matches a prefix and captures the command name after it, built once logged in
+command_prefix_re = None
+# Welcome channel messages are only handled if they contain one of these
+welcome_allowed_re = re.compile("reset|kick|ban|warn")
+
+
+def get_command_prefix_re():
+    global command_prefix_re
+    if command_prefix_re is None:
+        # Same order as get_prefix, the first prefix that matches wins
+        prefixes = [f"<@{bot.user.id}> ", f"<@!{bot.user.id}> "] + config.prefixes
+        command_prefix_re = re.compile(
+            "(?:" + "|".join(map(re.escape, prefixes)) + r")(\S+)"
+        )
+    return command_prefix_re
+
 
 if __name__ == "__main__":
     for cog in config.initial_cogs:
@@ -73,8 +93,6 @@ if __name__ == "__main__":
 
 @bot.event
 async def on_ready():
-    aioh = {"User-Agent": f"{script_name}/1.0'"}
-    bot.aiosession = aiohttp.ClientSession(headers=aioh)
     bot.app_info = await bot.application_info()
     bot.botlog_channel = bot.get_channel(config.botlog_channel)
 
@@ -91,6 +109,7 @@ async def on_ready():
         f"{guild.name} has {guild.member_count} members!"
     )
 
+    get_storage().export_jsons()
     data_files = [discord.File(fpath) for fpath in wanted_jsons]
     await bot.botlog_channel.send(msg, files=data_files)
 
@@ -214,14 +233,22 @@ async def on_message(message):
     if (message.guild) and (message.guild.id not in config.guild_whitelist):
         return
 
+    # Skip anything that doesn't start with a prefix and a known command name,
+    # bot.all_commands is kept up to date with names and aliases by discord.py
+    match = get_command_prefix_re().match(message.content)
+    if not match or match.group(1) not in bot.all_commands:
+        bot.dispatch_stats["fast_path"] += 1
+        return
+
     # Ignore messages in newcomers channel, unless it's potentially
     # an allowed command
-    welcome_allowed = ["reset", "kick", "ban", "warn"]
-    if message.channel.id == config.welcome_channel and not any(
-        cmd in message.content for cmd in welcome_allowed
+    if message.channel.id == config.welcome_channel and not welcome_allowed_re.search(
+        message.content
     ):
+        bot.dispatch_stats["fast_path"] += 1
         return
 
+    bot.dispatch_stats["dispatched"] += 1
     ctx = await bot.get_context(message)
     await bot.invoke(ctx)
 
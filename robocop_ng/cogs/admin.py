@@ -6,6 +6,8 @@ import inspect
 import re
 import config
 from helpers.checks import check_if_bot_manager
+from helpers.storage import get_storage
+from helpers.http import close_session
 
 
 class Admin(Cog):
@@ -20,6 +22,11 @@ class Admin(Cog):
     async def _exit(self, ctx):
         """Shuts down the bot, bot manager only."""
         await ctx.send(":wave: Goodbye!")
+        # Pins waiting to go to the pinboard gist would be lost otherwise
+        pin = self.bot.get_cog("Pin")
+        if pin is not None:
+            await pin.flush_pinboards()
+        await close_session()
         await self.bot.logout()
 
     @commands.guild_only()
@@ -37,9 +44,24 @@ class Admin(Cog):
     @commands.command()
     async def fetchdata(self, ctx):
         """Returns data files"""
+        get_storage().export_jsons()
         data_files = [discord.File(fpath) for fpath in self.bot.wanted_jsons]
         await ctx.send("Here you go:", files=data_files)
 
+    @commands.guild_only()
+    @commands.check(check_if_bot_manager)
+    @commands.command()
+    async def dispatchstats(self, ctx):
+        """Shows how many messages skipped command parsing, bot manager only."""
+        stats = self.bot.dispatch_stats
+        total = stats["fast_path"] + stats["dispatched"]
+        skipped = stats["fast_path"] / total * 100 if total else 0
+        await ctx.send(
+            f"Messages seen: {total}, skipped without parsing: "
+            f"{stats['fast_path']} ({skipped:.1f}%), "
+            f"handed to commands: {stats['dispatched']}."
+        )
+
     @commands.guild_only()
     @commands.check(check_if_bot_manager)
     @commands.command(name="eval")
@@ -6,6 +6,7 @@ import time
 import math
 import parsedatetime
 from discord.ext.commands import Cog
+from helpers.http import check_content_length, iter_limited, read_limited, request
 
 
 class Common(Cog):
@@ -73,7 +74,7 @@ class Common(Cog):
 
     async def aioget(self, url):
         try:
-            data = await self.bot.aiosession.get(url)
+            data = await request("GET", url)
             if data.status == 200:
                 text_data = await data.text()
                 self.bot.log.info(f"Data from {url}: {text_data}")
@@ -88,9 +89,9 @@ class Common(Cog):
 
     async def aiogetbytes(self, url):
         try:
-            data = await self.bot.aiosession.get(url)
+            data = await request("GET", url)
             if data.status == 200:
-                byte_data = await data.read()
+                byte_data = await read_limited(data)
                 self.bot.log.debug(f"Data from {url}: {byte_data}")
                 return byte_data
             else:
@@ -103,7 +104,7 @@ class Common(Cog):
 
     async def aiojson(self, url):
         try:
-            data = await self.bot.aiosession.get(url)
+            data = await request("GET", url)
             if data.status == 200:
                 text_data = await data.text()
                 self.bot.log.info(f"Data from {url}: {text_data}")
@@ -129,10 +130,11 @@ class Common(Cog):
     # by link2110 (https://stackoverflow.com/users/5890923/link2110)
     # modified by Ave (https://github.com/aveao), licensed CC-BY-SA 3.0
     async def download_file(self, url, local_filename):
-        file_resp = await self.bot.aiosession.get(url)
-        file = await file_resp.read()
-        with open(local_filename, "wb") as f:
-            f.write(file)
+        async with await request("GET", url) as file_resp:
+            check_content_length(file_resp)
+            with open(local_filename, "wb") as f:
+                async for chunk in iter_limited(file_resp.content.read):
+                    f.write(chunk)
 
     # 2000 is maximum limit of discord
     async def slice_message(self, text, size=2000, prefix="", suffix=""):
@@ -154,7 +156,7 @@ class Common(Cog):
         return reply_list
 
     async def haste(self, text, instance="https://mystb.in/"):
-        response = await self.bot.aiosession.post(f"{instance}documents", data=text)
+        response = await request("POST", f"{instance}documents", data=text)
         if response.status == 200:
             result_json = await response.json()
             return f"{instance}{result_json['key']}"
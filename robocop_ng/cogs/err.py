@@ -1,9 +1,14 @@
+import io
 import re
 import discord
 
 from discord.ext import commands
 from discord.ext.commands import Cog
-from helpers.errcodes import *
+from helpers.errcodes import (
+    find_switch_errcode,
+    find_switch_errcode_range,
+    get_errcode_tables,
+)
 
 
 class Err(Cog):
@@ -14,6 +19,11 @@ class Err(Cog):
         self.dds_re = re.compile(r"0\d{2}\-\d{4}")
         self.wiiu_re = re.compile(r"1\d{2}\-\d{4}")
         self.switch_re = re.compile(r"2\d{3}\-\d{4}")
+        # Anything err would take, for picking codes out of longer text
+        self.switch_errs_re = re.compile(
+            r"\b(?:2\d{3}-\d{4}|0x[0-9a-fA-F]{1,8}|2-[A-Z0-9]{5}-\d{4})\b"
+        )
+        self.max_errs_file_size = 1000 * 1000
         self.no_err_desc = (
             "It seems like your error code is unknown. "
             "You can check on Switchbrew for your error code at "
@@ -25,9 +35,10 @@ class Err(Cog):
     async def dderr(self, ctx, err: str):
         """Searches for 3DS error codes!
         Usage: .ddserr/.3err/.dserr/.3dserr <Error Code>"""
+        errcodes = get_errcode_tables()
         if self.dds_re.match(err):  # 3DS - dds -> Drei DS -> Three DS
-            if err in dds_errcodes:
-                err_description = dds_errcodes[err]
+            if err in errcodes["dds_errcodes"]:
+                err_description = errcodes["dds_errcodes"][err]
             else:
                 err_description = self.no_err_desc
             # Make a nice Embed out of it
@@ -49,10 +60,16 @@ class Err(Cog):
             summ = (rc >> 21) & 0x3F
             level = (rc >> 27) & 0x1F
             embed = discord.Embed(title=f"0x{rc:X}")
-            embed.add_field(name="Module", value=dds_modules.get(mod, mod))
-            embed.add_field(name="Description", value=dds_descriptions.get(desc, desc))
-            embed.add_field(name="Summary", value=dds_summaries.get(summ, summ))
-            embed.add_field(name="Level", value=dds_levels.get(level, level))
+            embed.add_field(name="Module", value=errcodes["dds_modules"].get(mod, mod))
+            embed.add_field(
+                name="Description", value=errcodes["dds_descriptions"].get(desc, desc)
+            )
+            embed.add_field(
+                name="Summary", value=errcodes["dds_summaries"].get(summ, summ)
+            )
+            embed.add_field(
+                name="Level", value=errcodes["dds_levels"].get(level, level)
+            )
             embed.set_footer(text="Console: 3DS")
 
             await ctx.send(embed=embed)
@@ -67,6 +84,7 @@ class Err(Cog):
     async def wiiuerr(self, ctx, err: str):
         """Searches for Wii U error codes!
             Usage: .wiiuserr/.uerr/.wuerr/.mochaerr <Error Code>"""
+        wii_u_errors = get_errcode_tables()["wii_u_errors"]
         if self.wiiu_re.match(err):  # Wii U
             module = err[2:3]  # Is that even true, idk just guessing
             desc = err[5:8]
@@ -91,6 +109,32 @@ class Err(Cog):
                 "no error code or you made some mistake!"
             )
 
+    def lookup_switch_err(self, err):
+        if err.startswith("0x"):
+            err = err[2:]
+            errcode = int(err, 16)
+            module = errcode & 0x1FF
+            desc = (errcode >> 9) & 0x3FFF
+        else:
+            module = int(err[0:4]) - 2000
+            desc = int(err[5:9])
+            errcode = (desc << 9) + module
+
+        str_errcode = f"{(module + 2000):04}-{desc:04}"
+
+        # Searching for Modules in list
+        err_module = get_errcode_tables()["switch_modules"].get(module, "Unknown")
+
+        # Searching for error codes related to the Switch
+        # (doesn't include special cases)
+        err_description = (
+            find_switch_errcode(errcode)
+            or find_switch_errcode_range(module, desc)
+            or self.no_err_desc
+        )
+
+        return str_errcode, errcode, module, err_module, desc, err_description
+
     @commands.command(aliases=["nxerr", "serr"])
     async def err(self, ctx, err: str):
         """Searches for Switch error codes!
@@ -98,37 +142,14 @@ class Err(Cog):
 
         if self.switch_re.match(err) or err.startswith("0x"):  # Switch
 
-            if err.startswith("0x"):
-                err = err[2:]
-                errcode = int(err, 16)
-                module = errcode & 0x1FF
-                desc = (errcode >> 9) & 0x3FFF
-            else:
-                module = int(err[0:4]) - 2000
-                desc = int(err[5:9])
-                errcode = (desc << 9) + module
-
-            str_errcode = f"{(module + 2000):04}-{desc:04}"
-
-            # Searching for Modules in list
-            if module in switch_modules:
-                err_module = switch_modules[module]
-            else:
-                err_module = "Unknown"
-
-            # Set initial value unconditionally
-            err_description = self.no_err_desc
-
-            # Searching for error codes related to the Switch
-            # (doesn't include special cases)
-            if errcode in switch_known_errcodes:
-                err_description = switch_known_errcodes[errcode]
-            elif errcode in switch_support_page:
-                err_description = switch_support_page[errcode]
-            elif module in switch_known_errcode_ranges:
-                for errcode_range in switch_known_errcode_ranges[module]:
-                    if desc >= errcode_range[0] and desc <= errcode_range[1]:
-                        err_description = errcode_range[2]
+            (
+                str_errcode,
+                errcode,
+                module,
+                err_module,
+                desc,
+                err_description,
+            ) = self.lookup_switch_err(err)
 
             # Make a nice Embed out of it
             embed = discord.Embed(
@@ -150,8 +171,8 @@ class Err(Cog):
 
         # Special case handling because Nintendo feels like
         # its required to break their format lol
-        elif err in switch_game_err:
-            game, desc = switch_game_err[err].split(":")
+        elif err in get_errcode_tables()["switch_game_err"]:
+            game, desc = get_errcode_tables()["switch_game_err"][err].split(":")
 
             embed = discord.Embed(title=err, url=self.rickroll, description=desc)
             embed.set_footer(text="Console: Switch")
@@ -165,6 +186,54 @@ class Err(Cog):
                 "no error code or you made some mistake!"
             )
 
+    @commands.command(aliases=["nxerrs", "serrs"])
+    async def errs(self, ctx, *, errs: str = ""):
+        """Looks up every Switch error code in a message or attached text file.
+        Usage: .errs/.nxerrs/.serrs <Error Codes> or a .txt file"""
+        if ctx.message.attachments:
+            attachment = ctx.message.attachments[0]
+            if attachment.size > self.max_errs_file_size:
+                return await ctx.send("That file is too big to look through!")
+            errs += "\n" + (await attachment.read()).decode("utf-8", "replace")
+
+        lines = []
+        seen = set()
+        for match in self.switch_errs_re.finditer(errs):
+            err = match.group(0)
+            if err in get_errcode_tables()["switch_game_err"]:
+                str_errcode = err
+                err_description = get_errcode_tables()["switch_game_err"][err]
+            elif err.startswith("2-"):
+                # Game error codes only come from the table, there's nothing to decode
+                str_errcode = err
+                err_description = "Unknown game error code."
+            else:
+                str_errcode, errcode, _, err_module, _, err_description = (
+                    self.lookup_switch_err(err)
+                )
+                str_errcode = f"{str_errcode} / {hex(errcode)} ({err_module.strip()})"
+            if str_errcode in seen:
+                continue
+            seen.add(str_errcode)
+            lines.append(f"**{str_errcode}**: {err_description}")
+
+        if not lines:
+            return await ctx.send(
+                "Unknown Format - This is either "
+                "no error code or you made some mistake!"
+            )
+
+        text = "\n".join(lines)
+        if len(text) <= 2048:
+            embed = discord.Embed(description=text)
+            embed.set_footer(text=f"{len(lines)} error codes | Console: Switch")
+            await ctx.send(embed=embed)
+        else:
+            await ctx.send(
+                f"Found {len(lines)} error codes:",
+                file=discord.File(io.BytesIO(text.encode("utf-8")), "errcodes.txt"),
+            )
+
     @commands.command(aliases=["e2h"])
     async def err2hex(self, ctx, err: str):
         """Converts Nintendo Switch errors to hex
@@ -2,7 +2,9 @@ import discord
 from discord.ext import commands
 from discord.ext.commands import Cog
 from helpers.checks import check_if_staff_or_ot
+import io
 import textwrap
+from concurrent.futures import ThreadPoolExecutor
 import PIL.Image
 import PIL.ImageFilter
 import PIL.ImageOps
@@ -13,27 +15,37 @@ import PIL.ImageDraw
 class ImageManip(Cog):
     def __init__(self, bot):
         self.bot = bot
-
-    @commands.cooldown(1, 60 * 60 * 3, type=commands.BucketType.user)
-    @commands.check(check_if_staff_or_ot)
-    @commands.command(hidden=True)
-    async def cox(self, ctx, *, headline: str):
-        """Gives a cox headline"""
-        mention = ctx.author.mention
-
-        headline = await commands.clean_content(fix_channel_mentions=True).convert(
-            ctx, headline
-        )
-
-        in_vice = "assets/motherboardlogo.png"
-        in_byjcox = "assets/byjcox.png"
-        font_path = "assets/neue-haas-grotesk-display-bold-regular.otf"
+        # A single thread, PIL fonts aren't safe to share between threads
+        self.renderer = ThreadPoolExecutor(max_workers=1)
+        # Decoded images and font, loaded by the renderer on first use
+        self.cox_assets = None
+
+    def cog_unload(self):
+        self.renderer.shutdown(wait=False)
+
+    def load_cox_assets(self):
+        if self.cox_assets is None:
+            in_vice = "assets/motherboardlogo.png"
+            in_byjcox = "assets/byjcox.png"
+            font_path = "assets/neue-haas-grotesk-display-bold-regular.otf"
+            font_size = 50
+
+            with PIL.Image.open(in_vice) as moboim, PIL.Image.open(in_byjcox) as jcoxim:
+                self.cox_assets = (
+                    moboim.copy(),
+                    jcoxim.copy(),
+                    PIL.ImageFont.truetype(font_path, font_size),
+                )
+        return self.cox_assets
+
+    def render_cox(self, headline):
+        """Draws a cox headline, runs in the renderer thread. Returns a PNG buffer."""
+        moboim, jcoxim, f = self.load_cox_assets()
 
         # Settings for image generation, don't touch anything
         horipos = 18
         vertpos = 75
         line_spacing = 10
-        font_size = 50
         image_width = 800
         font_wrap_count = 30
         sig_height = 15
@@ -43,12 +55,8 @@ class ImageManip(Cog):
         # not great, 4am be like
         image_height = (len(lines) + 2) * (vertpos + line_spacing)
 
-        # Load font
-        f = PIL.ImageFont.truetype(font_path, font_size)
-
         # Create image base, paste mobo logo
         im = PIL.Image.new("RGB", (image_width, image_height), color="#FFFFFF")
-        moboim = PIL.Image.open(in_vice)
         im.paste(moboim, (horipos, 17))
 
         # Go through all the wrapped text lines
@@ -71,16 +79,35 @@ class ImageManip(Cog):
             vertpos += size[1] + line_spacing
 
         # Add jcox signature
-        jcoxim = PIL.Image.open(in_byjcox)
         im.paste(jcoxim, (horipos, vertpos + sig_height))
 
         # Crop the image to the actual resulting size
         im = im.crop((0, 0, image_width, vertpos + (sig_height * 3)))
 
         # Save image
-        out_filename = f"/tmp/{ctx.message.id}-out.png"
-        im.save(out_filename, quality=100, optimize=True)
-        await ctx.send(content=f"{mention}: Enjoy.", file=discord.File(out_filename))
+        out = io.BytesIO()
+        im.save(out, format="PNG", quality=100, optimize=True)
+        out.seek(0)
+        return out
+
+    @commands.cooldown(1, 60 * 60 * 3, type=commands.BucketType.user)
+    @commands.check(check_if_staff_or_ot)
+    @commands.command(hidden=True)
+    async def cox(self, ctx, *, headline: str):
+        """Gives a cox headline"""
+        mention = ctx.author.mention
+
+        headline = await commands.clean_content(fix_channel_mentions=True).convert(
+            ctx, headline
+        )
+
+        out = await self.bot.loop.run_in_executor(
+            self.renderer, self.render_cox, headline
+        )
+        await ctx.send(
+            content=f"{mention}: Enjoy.",
+            file=discord.File(out, filename=f"{ctx.message.id}-out.png"),
+        )
 
 
 def setup(bot):
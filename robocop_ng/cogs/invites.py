@@ -1,8 +1,8 @@
 from discord.ext import commands
 from discord.ext.commands import Cog
 from helpers.checks import check_if_collaborator
+from helpers.invites import add_invite
 import config
-import json
 
 
 class Invites(Cog):
@@ -20,18 +20,7 @@ class Invites(Cog):
             max_age=0, max_uses=1, temporary=True, unique=True, reason=reason
         )
 
-        with open("data/invites.json", "r") as f:
-            invites = json.load(f)
-
-        invites[invite.id] = {
-            "uses": 0,
-            "url": invite.url,
-            "max_uses": 1,
-            "code": invite.code,
-        }
-
-        with open("data/invites.json", "w") as f:
-            f.write(json.dumps(invites))
+        add_invite(invite)
 
         await ctx.message.add_reaction("🆗")
         try:
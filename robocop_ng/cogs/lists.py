@@ -1,3 +1,5 @@
+import asyncio
+import bisect
 import config
 import discord
 import io
@@ -5,6 +7,8 @@ import urllib.parse
 import os.path
 from discord.ext import commands
 from discord.ext.commands import Cog
+from helpers.checks import check_if_staff
+from helpers.storage import get_storage
 
 
 class Lists(Cog):
@@ -14,6 +18,16 @@ class Lists(Cog):
 
     def __init__(self, bot):
         self.bot = bot
+        # Message ids and contents of the items in each list channel, oldest
+        # first. Kept in storage too, so a restart only has to catch up.
+        self.list_index = {}
+        # Changes seen while a channel's index is being built, applied after
+        self.list_index_pending = {}
+        self.list_index_lock = asyncio.Lock()
+        # Emoji each user reacted with on each message, by list channel
+        self.reaction_index = {}
+        self.reaction_index_pending = {}
+        self.reaction_index_lock = asyncio.Lock()
 
     # Helpers
 
@@ -49,20 +63,15 @@ class Lists(Cog):
         ]
         return str(reaction.emoji)[0] in allowed_reactions
 
-    async def find_reactions(self, user_id, channel_id, limit=None):
-        reactions = []
+    async def find_reactions(self, user_id, channel_id):
+        """Returns (message id, emoji) for each reaction of a user, newest first."""
         channel = self.bot.get_channel(channel_id)
-        async for message in channel.history(limit=limit):
-            if len(message.reactions) == 0:
-                continue
-
-            for reaction in message.reactions:
-                users = await reaction.users().flatten()
-                user_ids = map(lambda user: user.id, users)
-                if user_id in user_ids:
-                    reactions.append(reaction)
-
-        return reactions
+        user_reactions = (await self.get_reaction_index(channel)).get(user_id, {})
+        return [
+            (message_id, emoji)
+            for message_id in sorted(user_reactions, reverse=True)
+            for emoji in user_reactions[message_id]
+        ]
 
     def create_log_message(self, emoji, action, user, channel, reason=""):
         msg = (
@@ -89,10 +98,12 @@ class Lists(Cog):
 
         await message.edit(embed=None)
 
-    async def cache_message(self, message):
+    def cache_message(self, message):
         msg = {
             "has_attachment": False,
             "attachment_filename": "",
+            # Images of existing messages are only downloaded right before sending
+            "attachment": None,
             "attachment_data": b"",
             "content": message.content,
         }
@@ -109,19 +120,182 @@ class Lists(Cog):
             if attachment is not None:
                 msg["has_attachment"] = True
                 msg["attachment_filename"] = attachment.filename
-                msg["attachment_data"] = await attachment.read()
+                msg["attachment"] = attachment
 
         return msg
 
     async def send_cached_message(self, channel, message):
         if message["has_attachment"] == True:
+            attachment_data = message["attachment_data"]
+            if message["attachment"] is not None:
+                attachment_data = await message["attachment"].read()
             file = discord.File(
-                io.BytesIO(message["attachment_data"]),
+                io.BytesIO(attachment_data),
                 filename=message["attachment_filename"],
             )
-            await channel.send(content=message["content"], file=file)
+            return await channel.send(content=message["content"], file=file)
         else:
-            await channel.send(content=message["content"])
+            return await channel.send(content=message["content"])
+
+    async def rewrite_list(self, channel, messages, items, refresh_first=False):
+        """Makes the given list messages show items, editing as few as possible.
+
+        Extra items are sent and leftover messages deleted at the end of the list.
+        With refresh_first the first message is rewritten even if it's unchanged.
+        """
+        # Attachments can't be moved by editing, so everything from the first
+        # message or item with one gets sent again
+        resend_from = min(len(messages), len(items))
+        for index in range(resend_from):
+            if messages[index].attachments or items[index]["has_attachment"]:
+                resend_from = index
+                break
+
+        for index, (message, item) in enumerate(zip(messages[:resend_from], items)):
+            if message.content == item["content"] and not (
+                refresh_first and index == 0
+            ):
+                continue
+            # Reactions and raw text embeds belong to the old content
+            if message.embeds and config.list_files_channel != 0:
+                await self.clean_up_raw_text_file_message(message)
+            if message.reactions:
+                await message.clear_reactions()
+            await message.edit(content=item["content"], embed=None)
+
+        # New messages go out first so images are read from the old ones one
+        # at a time, then the old ones are removed from between the two
+        first_sent = None
+        for item in items[resend_from:]:
+            sent = await self.send_cached_message(channel, item)
+            first_sent = first_sent or sent
+
+        if resend_from < len(messages):
+            await channel.purge(
+                limit=None,
+                after=discord.Object(id=messages[resend_from].id - 1),
+                before=first_sent,
+                bulk=True,
+            )
+
+    async def get_list_index(self, channel):
+        async with self.list_index_lock:
+            if channel.id not in self.list_index:
+                await self.build_list_index(channel)
+        return self.list_index[channel.id]
+
+    async def build_list_index(self, channel, rebuild=False):
+        self.list_index.pop(channel.id, None)
+        self.list_index_pending[channel.id] = []
+        try:
+            stored = None if rebuild else get_storage().load_list_index(channel.id)
+            message_ids = [message_id for message_id, _ in stored or []]
+            contents = [content for _, content in stored or []]
+            # Only messages posted while the bot was away are missing from a
+            # stored index, edits and deletions from then need a reindexlist
+            after = discord.Object(id=message_ids[-1]) if message_ids else None
+            stored_count = len(message_ids)
+            async for message in channel.history(
+                limit=None, after=after, oldest_first=True
+            ):
+                if message.content.strip():
+                    message_ids.append(message.id)
+                    contents.append(message.content)
+            self.list_index[channel.id] = (message_ids, contents)
+            if stored is None or len(message_ids) > stored_count:
+                get_storage().save_list_index(
+                    channel.id, list(zip(message_ids, contents))
+                )
+        finally:
+            pending = self.list_index_pending.pop(channel.id)
+
+        for message_id, content in pending:
+            self.update_list_index(channel.id, message_id, content)
+
+    def update_list_index(self, channel_id, message_id, content):
+        """Sets the content of a message in the index, None removes it."""
+        if channel_id in self.list_index_pending:
+            self.list_index_pending[channel_id].append((message_id, content))
+            return
+        if channel_id not in self.list_index:
+            return
+
+        message_ids, contents = self.list_index[channel_id]
+        # Message ids grow over time, so they're already in list order
+        position = bisect.bisect_left(message_ids, message_id)
+        indexed = position < len(message_ids) and message_ids[position] == message_id
+        if content is not None and content.strip():
+            if indexed:
+                if contents[position] == content:
+                    return
+                contents[position] = content
+            else:
+                message_ids.insert(position, message_id)
+                contents.insert(position, content)
+        elif indexed:
+            del message_ids[position]
+            del contents[position]
+            content = None
+        else:
+            return
+        get_storage().update_list_item(channel_id, message_id, content)
+
+    async def get_reaction_index(self, channel):
+        async with self.reaction_index_lock:
+            if channel.id not in self.reaction_index:
+                await self.build_reaction_index(channel)
+        return self.reaction_index[channel.id]
+
+    async def build_reaction_index(self, channel):
+        self.reaction_index.pop(channel.id, None)
+        self.reaction_index_pending[channel.id] = []
+        try:
+            reactions = {}
+            async for message in channel.history(limit=None):
+                for reaction in message.reactions:
+                    async for user in reaction.users():
+                        user_reactions = reactions.setdefault(user.id, {})
+                        user_reactions.setdefault(message.id, set()).add(
+                            str(reaction.emoji)
+                        )
+            self.reaction_index[channel.id] = reactions
+        finally:
+            pending = self.reaction_index_pending.pop(channel.id)
+
+        for change in pending:
+            self.update_reaction_index(channel.id, *change)
+
+    def update_reaction_index(
+        self, channel_id, message_id, user_id=None, emoji=None, added=False
+    ):
+        """Adds or removes a reaction in the index.
+
+        When removing, a user_id or emoji of None matches all of them."""
+        if channel_id in self.reaction_index_pending:
+            self.reaction_index_pending[channel_id].append(
+                (message_id, user_id, emoji, added)
+            )
+            return
+        if channel_id not in self.reaction_index:
+            return
+
+        reactions = self.reaction_index[channel_id]
+        if added:
+            user_reactions = reactions.setdefault(user_id, {})
+            user_reactions.setdefault(message_id, set()).add(emoji)
+            return
+
+        for reactor_id in list(reactions) if user_id is None else [user_id]:
+            user_reactions = reactions.get(reactor_id, {})
+            emojis = user_reactions.get(message_id, set())
+            if emoji is None:
+                emojis.clear()
+            else:
+                emojis.discard(emoji)
+            if not emojis:
+                user_reactions.pop(message_id, None)
+            if not user_reactions:
+                reactions.pop(reactor_id, None)
 
     # Commands
 
@@ -136,21 +310,33 @@ class Lists(Cog):
             await ctx.send(f"{channel.mention} is not a list channel.")
             return
 
-        counter = 0
-        async for message in channel.history(limit=None, oldest_first=True):
-            if message.content.strip():
-                counter += 1
+        message_ids, contents = await self.get_list_index(channel)
+        if number > len(message_ids):
+            await ctx.send(f"Unable to find item #{number} in {channel.mention}.")
+            return
 
-            if counter == number:
-                embed = discord.Embed(
-                    title=f"Item #{number} in #{channel.name}",
-                    description=message.content,
-                    url=message.jump_url,
-                )
-                await ctx.send(content="", embed=embed)
-                return
+        message = channel.get_partial_message(message_ids[number - 1])
+        embed = discord.Embed(
+            title=f"Item #{number} in #{channel.name}",
+            description=contents[number - 1],
+            url=message.jump_url,
+        )
+        await ctx.send(content="", embed=embed)
 
-        await ctx.send(f"Unable to find item #{number} in {channel.mention}.")
+    @commands.check(check_if_staff)
+    @commands.command()
+    async def reindexlist(self, ctx, channel: discord.TextChannel):
+        """Rebuilds the item and reaction indexes of a list channel, staff only."""
+        if channel.id not in config.list_channels:
+            await ctx.send(f"{channel.mention} is not a list channel.")
+            return
+
+        async with self.list_index_lock:
+            await self.build_list_index(channel, rebuild=True)
+        async with self.reaction_index_lock:
+            await self.build_reaction_index(channel)
+        message_ids, _ = self.list_index[channel.id]
+        await ctx.send(f"Indexed {len(message_ids)} items in {channel.mention}.")
 
     # Listeners
 
@@ -162,6 +348,14 @@ class Lists(Cog):
         if payload.channel_id not in config.list_channels:
             return
 
+        self.update_reaction_index(
+            payload.channel_id,
+            payload.message_id,
+            payload.user_id,
+            str(payload.emoji),
+            added=True,
+        )
+
         channel = self.bot.get_channel(payload.channel_id)
         message = await channel.fetch_message(payload.message_id)
         member = channel.guild.get_member(payload.user_id)
@@ -193,11 +387,12 @@ class Lists(Cog):
             return
 
         # Remove all other reactions from user in this channel.
-        for r in await self.find_reactions(payload.user_id, payload.channel_id):
-            if r.message.id != message.id or (
-                r.message.id == message.id and str(r.emoji) != str(reaction.emoji)
-            ):
-                await r.remove(user)
+        reactions = await self.find_reactions(payload.user_id, payload.channel_id)
+        for message_id, emoji in reactions:
+            if message_id != message.id or emoji != str(reaction.emoji):
+                await channel.get_partial_message(message_id).remove_reaction(
+                    emoji, user
+                )
 
         # When editing we want to provide the user a copy of the raw text.
         if self.is_edit(reaction.emoji) and config.list_files_channel != 0:
@@ -223,6 +418,10 @@ class Lists(Cog):
         if payload.channel_id not in config.list_channels:
             return
 
+        self.update_reaction_index(
+            payload.channel_id, payload.message_id, payload.user_id, str(payload.emoji)
+        )
+
         channel = self.bot.get_channel(payload.channel_id)
         message = await channel.fetch_message(payload.message_id)
 
@@ -234,6 +433,38 @@ class Lists(Cog):
         if self.is_edit(payload.emoji) and config.list_files_channel != 0:
             await self.clean_up_raw_text_file_message(message)
 
+    @Cog.listener()
+    async def on_raw_reaction_clear(self, payload):
+        if payload.channel_id in config.list_channels:
+            self.update_reaction_index(payload.channel_id, payload.message_id)
+
+    @Cog.listener()
+    async def on_raw_reaction_clear_emoji(self, payload):
+        if payload.channel_id in config.list_channels:
+            self.update_reaction_index(
+                payload.channel_id, payload.message_id, emoji=str(payload.emoji)
+            )
+
+    @Cog.listener()
+    async def on_raw_message_edit(self, payload):
+        if payload.channel_id in config.list_channels and "content" in payload.data:
+            self.update_list_index(
+                payload.channel_id, payload.message_id, payload.data["content"]
+            )
+
+    @Cog.listener()
+    async def on_raw_message_delete(self, payload):
+        if payload.channel_id in config.list_channels:
+            self.update_list_index(payload.channel_id, payload.message_id, None)
+            self.update_reaction_index(payload.channel_id, payload.message_id)
+
+    @Cog.listener()
+    async def on_raw_bulk_message_delete(self, payload):
+        if payload.channel_id in config.list_channels:
+            for message_id in payload.message_ids:
+                self.update_list_index(payload.channel_id, message_id, None)
+                self.update_reaction_index(payload.channel_id, message_id)
+
     @Cog.listener()
     async def on_message(self, message):
         await self.bot.wait_until_ready()
@@ -242,6 +473,8 @@ class Lists(Cog):
         if message.channel.id not in config.list_channels:
             return
 
+        self.update_list_index(message.channel.id, message.id, message.content)
+
         # We don"t care about messages from bots.
         if message.author.bot:
             return
@@ -287,22 +520,31 @@ class Lists(Cog):
             else:
                 await channel.send(content)
 
-            for reaction in reactions:
-                await reaction.remove(user)
+            for message_id, emoji in reactions:
+                await channel.get_partial_message(message_id).remove_reaction(
+                    emoji, user
+                )
 
             await log_channel.send(
                 self.create_log_message("💬", "List item added:", user, channel)
             )
             return
 
-        targeted_reaction = reactions[0]
-        targeted_message = targeted_reaction.message
+        targeted_message_id, targeted_reaction = reactions[0]
+        targeted_message = await channel.fetch_message(targeted_message_id)
+        new_item = {
+            "has_attachment": attachment_data is not None,
+            "attachment_filename": attachment_filename,
+            "attachment": None,
+            "attachment_data": attachment_data,
+            "content": content,
+        }
 
         if self.is_edit(targeted_reaction):
             if config.list_files_channel != 0:
                 await self.clean_up_raw_text_file_message(targeted_message)
             await targeted_message.edit(content=content)
-            await targeted_reaction.remove(user)
+            await targeted_message.remove_reaction(targeted_reaction, user)
 
             await log_channel.send(
                 self.create_log_message("📝", "List item edited:", user, channel)
@@ -318,17 +560,15 @@ class Lists(Cog):
             )
 
         elif self.is_recycle(targeted_reaction):
-            messages = [await self.cache_message(targeted_message)]
+            await targeted_message.remove_reaction(targeted_reaction, user)
 
-            for message in await channel.history(
+            messages = [targeted_message] + await channel.history(
                 limit=None, after=targeted_message, oldest_first=True
-            ).flatten():
-                messages.append(await self.cache_message(message))
-
-            await channel.purge(limit=len(messages) + 1, bulk=True)
-
-            for message in messages:
-                await self.send_cached_message(channel, message)
+            ).flatten()
+            # Same items in the same order, the targeted one is always rewritten
+            # and the attachment tail is sent again
+            items = [self.cache_message(message) for message in messages]
+            await self.rewrite_list(channel, messages, items, refresh_first=True)
 
             await log_channel.send(
                 self.create_log_message(
@@ -337,52 +577,26 @@ class Lists(Cog):
             )
 
         elif self.is_insert_above(targeted_reaction):
-            messages = [await self.cache_message(targeted_message)]
+            await targeted_message.remove_reaction(targeted_reaction, user)
 
-            for message in await channel.history(
+            messages = [targeted_message] + await channel.history(
                 limit=None, after=targeted_message, oldest_first=True
-            ).flatten():
-                messages.append(await self.cache_message(message))
-
-            await channel.purge(limit=len(messages) + 1, bulk=True)
-
-            if attachment_filename is not None and attachment_data is not None:
-                file = discord.File(
-                    io.BytesIO(attachment_data), filename=attachment_filename
-                )
-                await channel.send(content=content, file=file)
-            else:
-                await channel.send(content)
-
-            for message in messages:
-                await self.send_cached_message(channel, message)
+            ).flatten()
+            items = [new_item] + [self.cache_message(message) for message in messages]
+            await self.rewrite_list(channel, messages, items)
 
             await log_channel.send(
                 self.create_log_message("💬", "List item added:", user, channel)
             )
 
         elif self.is_insert_below(targeted_reaction):
-            await targeted_reaction.remove(user)
+            await targeted_message.remove_reaction(targeted_reaction, user)
 
-            messages = []
-
-            for message in await channel.history(
+            messages = await channel.history(
                 limit=None, after=targeted_message, oldest_first=True
-            ).flatten():
-                messages.append(await self.cache_message(message))
-
-            await channel.purge(limit=len(messages), bulk=True)
-
-            if attachment_filename is not None and attachment_data is not None:
-                file = discord.File(
-                    io.BytesIO(attachment_data), filename=attachment_filename
-                )
-                await channel.send(content=content, file=file)
-            else:
-                await channel.send(content)
-
-            for message in messages:
-                await self.send_cached_message(channel, message)
+            ).flatten()
+            items = [new_item] + [self.cache_message(message) for message in messages]
+            await self.rewrite_list(channel, messages, items)
 
             await log_channel.send(
                 self.create_log_message("💬", "List item added:", user, channel)
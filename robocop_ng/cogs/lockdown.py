@@ -1,55 +1,83 @@
+from functools import partial
 from discord.ext import commands
 from discord.ext.commands import Cog
 import config
 import discord
+from helpers.bulk import channel_bucket, run_bulk
 from helpers.checks import check_if_staff
 
 
 class Lockdown(Cog):
     def __init__(self, bot):
         self.bot = bot
+        # Roles to lock in each configured channel, later configs win
+        self.lockdown_roles = {}
+        for lockdown_conf in config.lockdown_configs.values():
+            for channel_id in lockdown_conf["channels"]:
+                self.lockdown_roles[channel_id] = lockdown_conf["roles"]
+        # Overwrites of locked channels from before they got locked
+        self.lockdown_snapshots = {}
+
+    def get_lockdown_roles(self, channel: discord.TextChannel):
+        return self.lockdown_roles.get(
+            channel.id, config.lockdown_configs["default"]["roles"]
+        )
 
-    async def set_sendmessage(
-        self, channel: discord.TextChannel, role, allow_send, issuer
-    ):
-        try:
+    def sendmessage_overwrites(self, channel: discord.TextChannel, allow_send):
+        """Channel overwrites with send messages set for its lockdown roles.
+
+        Staff roles are always allowed to send messages."""
+        overwrites = channel.overwrites
+        changes = [(role, allow_send) for role in self.get_lockdown_roles(channel)]
+        changes += [(role, True) for role in config.staff_role_ids]
+        for role, allow in changes:
             roleobj = channel.guild.get_role(role)
-            overrides = channel.overwrites_for(roleobj)
-            overrides.send_messages = allow_send
-            await channel.set_permissions(
-                roleobj, overwrite=overrides, reason=str(issuer)
+            if roleobj is None:
+                continue
+            overrides = overwrites.get(roleobj, discord.PermissionOverwrite())
+            overrides.send_messages = allow
+            overwrites[roleobj] = overrides
+        return overwrites
+
+    async def lock_channel(self, channel: discord.TextChannel, issuer):
+        # Locking twice keeps the first snapshot, it's the one to go back to
+        if channel.id not in self.lockdown_snapshots:
+            self.lockdown_snapshots[channel.id] = channel.overwrites
+        try:
+            await channel.edit(
+                overwrites=self.sendmessage_overwrites(channel, False),
+                reason=str(issuer),
             )
         except:
-            pass
-
-    async def unlock_for_staff(self, channel: discord.TextChannel, issuer):
-        for role in config.staff_role_ids:
-            await self.set_sendmessage(channel, role, True, issuer)
-
-    @commands.guild_only()
-    @commands.check(check_if_staff)
-    @commands.command()
-    async def lock(self, ctx, channel: discord.TextChannel = None, soft: bool = False):
-        """Prevents people from speaking in a channel, staff only.
-
-        Defaults to current channel."""
-        if not channel:
-            channel = ctx.channel
-        log_channel = self.bot.get_channel(config.modlog_channel)
-
-        roles = None
-        for key, lockdown_conf in config.lockdown_configs.items():
-            if channel.id in lockdown_conf["channels"]:
-                roles = lockdown_conf["roles"]
-
-        if roles is None:
-            roles = config.lockdown_configs["default"]["roles"]
-
-        for role in roles:
-            await self.set_sendmessage(channel, role, False, ctx.author)
+            del self.lockdown_snapshots[channel.id]
+            raise
+
+    async def unlock_channel(self, channel: discord.TextChannel, issuer):
+        # Channels locked before a restart have no snapshot, they just get unlocked
+        overwrites = self.lockdown_snapshots.get(channel.id)
+        if overwrites is None:
+            overwrites = self.sendmessage_overwrites(channel, True)
+        await channel.edit(overwrites=overwrites, reason=str(issuer))
+        self.lockdown_snapshots.pop(channel.id, None)
+
+    async def run_on_channels(self, channels, action, issuer):
+        # Every channel edit is its own rate limit bucket, so they all run at once
+        return await run_bulk(
+            (
+                channel_bucket("channel", channel),
+                channel,
+                partial(action, channel, issuer),
+            )
+            for channel in channels
+        )
 
-        await self.unlock_for_staff(channel, ctx.author)
+    def failed_channels_note(self, result):
+        if result.ok:
+            return ""
+        failed = ", ".join(result.describe_errors(lambda channel: channel.mention))
+        return f"\n⚠ Couldn't update: {failed}"
 
+    def lockdown_message(self, soft):
         public_msg = "🔒 Channel locked down. "
         if not soft:
             public_msg += (
@@ -57,48 +85,105 @@ class Lockdown(Cog):
                 "Do not bring the topic to other channels or risk "
                 "disciplinary actions."
             )
+        return public_msg
 
-        await ctx.send(public_msg)
+    async def log_lockdown(self, ctx, action, channels, result):
+        log_channel = self.bot.get_channel(config.modlog_channel)
         safe_name = await commands.clean_content(escape_markdown=True).convert(
             ctx, str(ctx.author)
         )
+        mentions = ", ".join(
+            channel.mention for channel in channels if channel not in result.errors
+        )
         msg = (
-            f"🔒 **Lockdown**: {ctx.channel.mention} by {ctx.author.mention} "
+            f"{action}: {mentions or 'no channels'} by {ctx.author.mention} "
             f"| {safe_name}"
         )
-        await log_channel.send(msg)
+        await log_channel.send(msg + self.failed_channels_note(result))
+
+    def get_lockdown_channels(self, guild, category):
+        if category is not None:
+            return category.text_channels
+        channel_ids = set(self.lockdown_roles) | set(self.lockdown_snapshots)
+        channels = [guild.get_channel(channel_id) for channel_id in channel_ids]
+        return [channel for channel in channels if channel is not None]
 
     @commands.guild_only()
     @commands.check(check_if_staff)
     @commands.command()
-    async def unlock(self, ctx, channel: discord.TextChannel = None):
-        """Unlocks speaking in current channel, staff only."""
+    async def lock(self, ctx, channel: discord.TextChannel = None, soft: bool = False):
+        """Prevents people from speaking in a channel, staff only.
+
+        Defaults to current channel."""
         if not channel:
             channel = ctx.channel
-        log_channel = self.bot.get_channel(config.modlog_channel)
-
-        roles = None
-        for key, lockdown_conf in config.lockdown_configs.items():
-            if channel.id in lockdown_conf["channels"]:
-                roles = lockdown_conf["roles"]
 
-        if roles is None:
-            roles = config.lockdown_configs["default"]["roles"]
+        result = await self.run_on_channels([channel], self.lock_channel, ctx.author)
+        if result.ok:
+            await ctx.send(self.lockdown_message(soft))
+        else:
+            await ctx.send(f"Couldn't lock {channel.mention}.")
+        await self.log_lockdown(ctx, "🔒 **Lockdown**", [channel], result)
 
-        await self.unlock_for_staff(channel, ctx.author)
+    @commands.guild_only()
+    @commands.check(check_if_staff)
+    @commands.command()
+    async def unlock(self, ctx, channel: discord.TextChannel = None):
+        """Unlocks speaking in current channel, staff only."""
+        if not channel:
+            channel = ctx.channel
 
-        for role in roles:
-            await self.set_sendmessage(channel, role, True, ctx.author)
+        result = await self.run_on_channels([channel], self.unlock_channel, ctx.author)
+        if result.ok:
+            await ctx.send("🔓 Channel unlocked.")
+        else:
+            await ctx.send(f"Couldn't unlock {channel.mention}.")
+        await self.log_lockdown(ctx, "🔓 **Unlock**", [channel], result)
 
-        safe_name = await commands.clean_content(escape_markdown=True).convert(
-            ctx, str(ctx.author)
+    @commands.guild_only()
+    @commands.check(check_if_staff)
+    @commands.command()
+    async def lockall(
+        self, ctx, category: discord.CategoryChannel = None, soft: bool = False
+    ):
+        """Locks every lockdown channel, or every channel in a category, staff only."""
+        channels = self.get_lockdown_channels(ctx.guild, category)
+        result = await self.run_on_channels(channels, self.lock_channel, ctx.author)
+
+        locked = [channel for channel in channels if channel not in result.errors]
+        public_msg = self.lockdown_message(soft)
+        await run_bulk(
+            (
+                channel_bucket("messages", channel),
+                channel,
+                partial(channel.send, public_msg),
+            )
+            for channel in locked
         )
-        await ctx.send("🔓 Channel unlocked.")
-        msg = (
-            f"🔓 **Unlock**: {ctx.channel.mention} by {ctx.author.mention} "
-            f"| {safe_name}"
+        await ctx.send(f"🔒 Locked {len(locked)}/{len(channels)} channels.")
+        await self.log_lockdown(ctx, "🔒 **Mass lockdown**", channels, result)
+
+    @commands.guild_only()
+    @commands.check(check_if_staff)
+    @commands.command()
+    async def unlockall(self, ctx, category: discord.CategoryChannel = None):
+        """Unlocks every lockdown channel, or every channel in a category, staff only.
+
+        Channels get back the exact permissions they had before being locked."""
+        channels = self.get_lockdown_channels(ctx.guild, category)
+        result = await self.run_on_channels(channels, self.unlock_channel, ctx.author)
+
+        unlocked = [channel for channel in channels if channel not in result.errors]
+        await run_bulk(
+            (
+                channel_bucket("messages", channel),
+                channel,
+                partial(channel.send, "🔓 Channel unlocked."),
+            )
+            for channel in unlocked
         )
-        await log_channel.send(msg)
+        await ctx.send(f"🔓 Unlocked {len(unlocked)}/{len(channels)} channels.")
+        await self.log_lockdown(ctx, "🔓 **Mass unlock**", channels, result)
 
 
 def setup(bot):
@@ -1,10 +1,15 @@
+import asyncio
 import discord
 from discord.ext.commands import Cog
-import json
+from functools import partial
 import re
 import config
 from helpers.restrictions import get_user_restrictions
+from helpers.userlogs import get_user_userlog
+from helpers.invites import get_invites, update_invites
 from helpers.checks import check_if_staff
+from helpers.aho_corasick import Automaton
+from helpers.bulk import guild_bucket, run_bulk
 
 
 class Logs(Cog):
@@ -19,11 +24,129 @@ class Logs(Cog):
         )
         self.name_re = re.compile(r"[a-zA-Z0-9].*")
         self.clean_re = re.compile(r"[^a-zA-Z0-9_ ]+", re.UNICODE)
-        # All lower case, no spaces, nothing non-alphanumeric
-        susp_hellgex = "|".join(
-            [r"\W*".join(list(word)) for word in config.suspect_words]
-        )
-        self.susp_hellgex = re.compile(susp_hellgex, re.IGNORECASE)
+        # Suspect and ignored words in one automaton, rebuilt when the config changes
+        self.suspect_scanner = None
+        self.suspect_scanner_words = None
+        # Invites by id as of the last refresh, loaded from storage on first use
+        self.invites = None
+        # Invite fetch in flight, and the one joins arriving meanwhile wait for
+        self.invite_refresh = None
+        self.next_invite_refresh = None
+        self.invites_changed = {}
+        self.invites_deleted = set()
+        self.invites_save_task = None
+
+    def cog_unload(self):
+        if self.invites_save_task is not None:
+            self.invites_save_task.cancel()
+            self.save_invites()
+
+    def get_cached_invites(self):
+        if self.invites is None:
+            self.invites = get_invites()
+        return self.invites
+
+    def set_invite(self, invite, uses):
+        entry = self.get_cached_invites()[invite.id] = {
+            "uses": uses,
+            "url": invite.url,
+            "max_uses": invite.max_uses,
+            "code": invite.code,
+        }
+        self.invites_changed[invite.id] = entry
+        self.invites_deleted.discard(invite.id)
+        return entry
+
+    def delete_invite(self, invite_id):
+        self.get_cached_invites().pop(invite_id, None)
+        self.invites_changed.pop(invite_id, None)
+        self.invites_deleted.add(invite_id)
+
+    def queue_invites_save(self):
+        # Changes made before the save goes out are written along with it
+        if self.invites_save_task is None:
+            self.invites_save_task = self.bot.loop.create_task(
+                self.save_invites_later()
+            )
+
+    async def save_invites_later(self):
+        await asyncio.sleep(config.invites_save_delay)
+        self.invites_save_task = None
+        self.save_invites()
+
+    def save_invites(self):
+        changed, self.invites_changed = self.invites_changed, {}
+        deleted, self.invites_deleted = self.invites_deleted, set()
+        if changed or deleted:
+            update_invites(changed, deleted)
+
+    async def get_used_invites(self, guild):
+        """Returns the codes of invites used since the previous fetch, and how
+        many joins share that fetch. The codes are None if the fetch failed.
+
+        A join fetches right away, joins coming in while a fetch is in flight
+        share the one that goes out after it."""
+        refresh = self.next_invite_refresh
+        if refresh is None:
+            refresh = self.next_invite_refresh = {"joins": 0}
+            refresh["task"] = self.bot.loop.create_task(
+                self.refresh_invites(guild, refresh, self.invite_refresh)
+            )
+        refresh["joins"] += 1
+        used = await asyncio.shield(refresh["task"])
+        return used, refresh["joins"]
+
+    async def refresh_invites(self, guild, refresh, previous):
+        if previous is not None:
+            await asyncio.wait([previous["task"]])
+        # Joins from here on wait for the next fetch, this one may have missed them
+        self.next_invite_refresh = None
+        self.invite_refresh = refresh
+        try:
+            real_invites = {invite.id: invite for invite in await guild.invites()}
+        except discord.HTTPException:
+            return None
+        finally:
+            self.invite_refresh = None
+
+        invites = self.get_cached_invites()
+        used = []
+        for invite_id, real_invite in real_invites.items():
+            entry = invites.get(invite_id)
+            if entry is None:
+                # Unknown active invite, can happen if it was created while offline
+                entry = self.set_invite(real_invite, 0)
+            if entry["uses"] < real_invite.uses:
+                used.append(entry["code"])
+                entry["uses"] = real_invite.uses
+                self.invites_changed[invite_id] = entry
+
+        for invite_id in invites.keys() - real_invites.keys():
+            # Invite does not exist anymore. Was either revoked manually
+            # or the final use was used up
+            used.append(invites[invite_id]["code"])
+            self.delete_invite(invite_id)
+
+        self.queue_invites_save()
+        return used
+
+    @Cog.listener()
+    async def on_invite_create(self, invite):
+        if invite.guild.id not in config.guild_whitelist:
+            return
+        self.set_invite(invite, invite.uses or 0)
+        self.queue_invites_save()
+
+    @Cog.listener()
+    async def on_invite_delete(self, invite):
+        if invite.guild.id not in config.guild_whitelist:
+            return
+        entry = self.get_cached_invites().get(invite.id)
+        # Limited invites also get deleted when used up, so they're kept
+        # until the next refresh can attribute that last use to a join
+        if entry is not None and not entry["max_uses"]:
+            self.delete_invite(invite.id)
+            self.queue_invites_save()
 
     @Cog.listener()
     async def on_member_join(self, member):
@@ -37,52 +160,23 @@ class Logs(Cog):
         escaped_name = self.bot.escape_message(member)
 
         # Attempt to correlate the user joining with an invite
-        with open("data/invites.json", "r") as f:
-            invites = json.load(f)
-
-        real_invites = await member.guild.invites()
-
-        # Add unknown active invites. Can happen if invite was manually created
-        for invite in real_invites:
-            if invite.id not in invites:
-                invites[invite.id] = {
-                    "uses": 0,
-                    "url": invite.url,
-                    "max_uses": invite.max_uses,
-                    "code": invite.code,
-                }
-
-        probable_invites_used = []
-        items_to_delete = []
-        # Look for invites whose usage increased since last lookup
-        for id, invite in invites.items():
-            real_invite = next((x for x in real_invites if x.id == id), None)
-
-            if real_invite is None:
-                # Invite does not exist anymore. Was either revoked manually
-                # or the final use was used up
-                probable_invites_used.append(invite)
-                items_to_delete.append(id)
-            elif invite["uses"] < real_invite.uses:
-                probable_invites_used.append(invite)
-                invite["uses"] = real_invite.uses
-
-        # Delete used up invites
-        for id in items_to_delete:
-            del invites[id]
-
-        # Save invites data.
-        with open("data/invites.json", "w") as f:
-            f.write(json.dumps(invites))
+        probable_invites_used, joins = await self.get_used_invites(member.guild)
 
         # Prepare the invite correlation message
-        if len(probable_invites_used) == 1:
-            invite_used = probable_invites_used[0]["code"]
+        if probable_invites_used is None:
+            invite_used = "Unknown (couldn't fetch invites)"
+        elif len(probable_invites_used) == 1:
+            invite_used = probable_invites_used[0]
         elif len(probable_invites_used) == 0:
             invite_used = "Unknown"
         else:
             invite_used = "One of: "
-            invite_used += ", ".join([x["code"] for x in probable_invites_used])
+            invite_used += ", ".join(probable_invites_used)
+            if joins > 1:
+                invite_used += (
+                    f" (used by {joins} members joining at once, "
+                    "can't tell which one each used)"
+                )
 
         # Check if user account is older than 15 minutes
         age = member.joined_at - member.created_at
@@ -125,29 +219,80 @@ class Logs(Cog):
         # Handles user restrictions
         # Basically, gives back muted role to users that leave with it.
         rsts = get_user_restrictions(member.id)
-        roles = [discord.utils.get(member.guild.roles, id=rst) for rst in rsts]
-        await member.add_roles(*roles)
+        roles = [member.guild.get_role(rst) for rst in rsts]
+        result = await run_bulk(
+            (
+                guild_bucket("member_roles", member.guild),
+                role,
+                partial(member.add_roles, role),
+            )
+            for role in roles
+            if role is not None
+        )
+        if not result.ok:
+            failed = ", ".join(result.describe_errors(lambda role: role.name))
+            await log_channel.send(
+                f"⚠ Couldn't restore restrictions for {member.mention}: {failed}"
+            )
 
         # Real hell zone.
-        with open("data/userlog.json", "r") as f:
-            warns = json.load(f)
-        try:
-            if len(warns[str(member.id)]["warns"]) == 0:
-                await log_channel.send(msg)
-            else:
-                embed = discord.Embed(
-                    color=discord.Color.dark_red(), title=f"Warns for {escaped_name}"
-                )
-                embed.set_thumbnail(url=member.avatar_url)
-                for idx, warn in enumerate(warns[str(member.id)]["warns"]):
-                    embed.add_field(
-                        name=f"{idx + 1}: {warn['timestamp']}",
-                        value=f"Issuer: {warn['issuer_name']}"
-                        f"\nReason: {warn['reason']}",
-                    )
-                await log_channel.send(msg, embed=embed)
-        except KeyError:  # if the user is not in the file
+        userlog = get_user_userlog(member.id)
+        if userlog is None or not userlog.get("warns"):
             await log_channel.send(msg)
+        else:
+            embed = discord.Embed(
+                color=discord.Color.dark_red(), title=f"Warns for {escaped_name}"
+            )
+            embed.set_thumbnail(url=member.avatar_url)
+            for idx, warn in enumerate(userlog["warns"]):
+                embed.add_field(
+                    name=f"{idx + 1}: {warn['timestamp']}",
+                    value=f"Issuer: {warn['issuer_name']}"
+                    f"\nReason: {warn['reason']}",
+                )
+            await log_channel.send(msg, embed=embed)
+
+    def get_suspect_scanner(self):
+        words = (tuple(config.suspect_words), tuple(config.suspect_ignored_words))
+        if words != self.suspect_scanner_words:
+            self.suspect_scanner = Automaton(words[0] + words[1])
+            self.suspect_scanner_words = words
+        return self.suspect_scanner
+
+    def highlight_suspect_words(self, text):
+        """Bolds suspect words in text, even when split up by non-word characters."""
+        # Scan only the word characters, remembering where each one came from
+        word_chars = []
+        positions = []
+        for position, char in enumerate(text):
+            if char.isalnum() or char == "_":
+                for lower_char in char.lower():
+                    word_chars.append(lower_char)
+                    positions.append(position)
+
+        # Leftmost match first, earlier words win ties, no overlaps
+        suspect_count = len(config.suspect_words)
+        matches = sorted(
+            (start, word_index, end)
+            for start, end, word_index in self.get_suspect_scanner().find_all(
+                "".join(word_chars)
+            )
+            if word_index < suspect_count
+        )
+        highlighted = []
+        last_end = 0
+        for start, _, end in matches:
+            if start < last_end:
+                continue
+            highlighted.append(positions[start])
+            highlighted.append(positions[end - 1] + 1)
+            last_end = end
+
+        parts = []
+        for index, position in enumerate([0] + highlighted):
+            end = highlighted[index] if index < len(highlighted) else len(text)
+            parts.append(text[position:end])
+        return "**".join(parts)
 
     async def do_spy(self, message):
         if message.author.bot:
@@ -168,11 +313,12 @@ class Logs(Cog):
             msg += f"\n- Has invite: https://{invite[0]}"
             alert = True
 
-        for susp_word in config.suspect_words:
-            if susp_word in cleancont and not any(
-                ok_word in cleancont for ok_word in config.suspect_ignored_words
-            ):
-                msg += f"\n- Contains suspicious word: `{susp_word}`"
+        scanner = self.get_suspect_scanner()
+        suspect_count = len(config.suspect_words)
+        found = {word_index for _, _, word_index in scanner.find_all(cleancont)}
+        if not any(word_index >= suspect_count for word_index in found):
+            for word_index in sorted(found):
+                msg += f"\n- Contains suspicious word: `{scanner.words[word_index]}`"
                 alert = True
 
         if alert:
@@ -181,9 +327,7 @@ class Logs(Cog):
 
             # Bad Code :tm:, blame retr0id
             message_clean = message.content.replace("*", "").replace("_", "")
-            regd = self.susp_hellgex.sub(
-                lambda w: "**{}**".format(w.group(0)), message_clean
-            )
+            regd = self.highlight_suspect_words(message_clean)
 
             # Show a message embed
             embed = discord.Embed(description=regd)
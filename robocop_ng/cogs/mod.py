@@ -1,9 +1,10 @@
+import asyncio
 import discord
 from discord.ext import commands
 from discord.ext.commands import Cog
 import config
 from helpers.checks import check_if_staff, check_if_bot_manager
-from helpers.userlogs import userlog
+from helpers.userlogs import userlog, userlog_many
 from helpers.restrictions import add_restriction, remove_restriction
 import io
 
@@ -11,6 +12,8 @@ import io
 class Mod(Cog):
     def __init__(self, bot):
         self.bot = bot
+        # Cancel events of the running massbans, by guild id
+        self.massban_cancels = {}
 
     def check_if_target_is_staff(self, target):
         return any(r.id in config.staff_role_ids for r in target.roles)
@@ -362,48 +365,127 @@ class Mod(Cog):
     @commands.command()
     async def massban(self, ctx, *, targets: str):
         """Bans users with their IDs, doesn't message them, staff only."""
-        targets_int = [int(target) for target in targets.strip().split(" ")]
-        for target in targets_int:
-            target_user = await self.bot.fetch_user(target)
-            target_member = ctx.guild.get_member(target)
-            # Hedge-proofing the code
-            if target == ctx.author.id:
-                await ctx.send(f"(re: {target}) You can't do mod actions on yourself.")
-                continue
-            elif target == self.bot.user:
-                await ctx.send(
-                    f"(re: {target}) I'm sorry {ctx.author.mention}, I'm afraid I can't do that."
-                )
-                continue
-            elif target_member and self.check_if_target_is_staff(target_member):
-                await ctx.send(
-                    f"(re: {target}) I can't ban this user as they're a member of staff."
-                )
-                continue
-
-            userlog(target, ctx.author, f"massban", "bans", target_user.name)
-
-            safe_name = await commands.clean_content(escape_markdown=True).convert(
-                ctx, str(target)
-            )
-
-            await ctx.guild.ban(
-                target_user,
-                reason=f"{ctx.author}, reason: massban",
-                delete_message_days=0,
+        if ctx.guild.id in self.massban_cancels:
+            return await ctx.send("A massban is already running, wait for it to end.")
+
+        # Registered before anything is awaited so a cancel is never missed
+        cancel = asyncio.Event()
+        self.massban_cancels[ctx.guild.id] = cancel
+        # discord.py queues requests per rate limit bucket, this caps what's in flight
+        semaphore = asyncio.Semaphore(config.massban_concurrency)
+        to_ban = []
+        banned = []
+        failed = []
+        logged = 0
+
+        def log_bans():
+            # Bans are logged in batches as they go, a crash loses at most one
+            nonlocal logged
+            userlog_many(
+                [(user.id, user.name) for user in banned[logged:]],
+                ctx.author,
+                "massban",
+                "bans",
             )
-            chan_message = (
-                f"⛔ **Massban**: {str(ctx.author)} banned "
-                f"{target_user.mention} | {safe_name}\n"
-                f"🏷 __User ID__: {target}\n"
-                "Please add an explanation below."
+            logged = len(banned)
+
+        async def ban(target):
+            async with semaphore:
+                if cancel.is_set():
+                    return
+                try:
+                    target_user = await self.bot.fetch_user(target)
+                    await ctx.guild.ban(
+                        target_user,
+                        reason=f"{ctx.author}, reason: massban",
+                        delete_message_days=0,
+                    )
+                    banned.append(target_user)
+                except discord.HTTPException as error:
+                    failed.append(f"{target} ({error.text or error.status})")
+
+        def progress_text():
+            return (
+                f"Massbanning: {len(banned)}/{len(to_ban)} banned, "
+                f"{len(failed)} failed. Use `{config.prefixes[0]}cancelmassban` to stop."
             )
 
-            chan_message += f"\n🔗 __Jump__: <{ctx.message.jump_url}>"
+        async def report_progress():
+            while True:
+                await asyncio.sleep(3)
+                log_bans()
+                await progress.edit(content=progress_text())
 
+        reporter = None
+        try:
+            targets_int = list(dict.fromkeys(int(target) for target in targets.split()))
+            for target in targets_int:
+                target_member = ctx.guild.get_member(target)
+                # Hedge-proofing the code
+                if target == ctx.author.id:
+                    await ctx.send(
+                        f"(re: {target}) You can't do mod actions on yourself."
+                    )
+                elif target == self.bot.user.id:
+                    await ctx.send(
+                        f"(re: {target}) I'm sorry {ctx.author.mention}, I'm afraid I can't do that."
+                    )
+                elif target_member and self.check_if_target_is_staff(target_member):
+                    await ctx.send(
+                        f"(re: {target}) I can't ban this user as they're a member of staff."
+                    )
+                else:
+                    to_ban.append(target)
+
+            progress = await ctx.send(progress_text())
+            reporter = self.bot.loop.create_task(report_progress())
+            await asyncio.gather(*(ban(target) for target in to_ban))
+        finally:
+            if reporter is not None:
+                reporter.cancel()
+            del self.massban_cancels[ctx.guild.id]
+            log_bans()
+
+        if banned:
+            lines = [
+                f"⛔ **Massban**: {str(ctx.author)} banned {len(banned)} users:",
+                *(
+                    f"{user.mention} | {discord.utils.escape_markdown(str(user))} "
+                    f"| 🏷 {user.id}"
+                    for user in banned
+                ),
+                "Please add an explanation below.",
+                f"🔗 __Jump__: <{ctx.message.jump_url}>",
+            ]
             log_channel = self.bot.get_channel(config.modlog_channel)
-            await log_channel.send(chan_message)
-        await ctx.send(f"All {len(targets_int)} users are now b&. 👍")
+            for chunk in self.chunk_lines(lines):
+                await log_channel.send(chunk)
+
+        result = f"{len(banned)} of {len(to_ban)} users are now b&. 👍"
+        if cancel.is_set():
+            result += " The rest was cancelled."
+        if failed:
+            result += f"\nFailed: {', '.join(failed)}"
+        await progress.edit(content=result[:2000])
+
+    def chunk_lines(self, lines, size=2000):
+        """Joins lines into as few messages as fit within size."""
+        chunks = [""]
+        for line in lines:
+            if chunks[-1] and len(chunks[-1]) + len(line) + 1 > size:
+                chunks.append("")
+            chunks[-1] += line + "\n"
+        return chunks
+
+    @commands.guild_only()
+    @commands.check(check_if_staff)
+    @commands.command()
+    async def cancelmassban(self, ctx):
+        """Stops a running massban after the bans in progress, staff only."""
+        if ctx.guild.id not in self.massban_cancels:
+            return await ctx.send("There's no massban running.")
+        self.massban_cancels[ctx.guild.id].set()
+        await ctx.send("Massban cancelled.")
 
     @commands.guild_only()
     @commands.bot_has_permissions(ban_members=True)
@@ -2,9 +2,12 @@ import discord
 from discord.ext import commands
 from discord.ext.commands import Cog
 import config
-import json
 from helpers.checks import check_if_staff
-from helpers.userlogs import get_userlog, set_userlog, userlog_event_types
+from helpers.userlogs import (
+    get_user_userlog,
+    save_user_userlog,
+    userlog_event_types,
+)
 
 
 class ModUserlog(Cog):
@@ -20,17 +23,17 @@ class ModUserlog(Cog):
             wanted_events = [event]
         embed = discord.Embed(color=discord.Color.dark_red())
         embed.set_author(name=f"Userlog for {name}")
-        userlog = get_userlog()
+        userlog = get_user_userlog(uid)
 
-        if uid not in userlog:
+        if userlog is None:
             embed.description = f"There are none!{own_note} (no entry)"
             embed.color = discord.Color.green()
             return embed
 
         for event_type in wanted_events:
-            if event_type in userlog[uid] and userlog[uid][event_type]:
+            if event_type in userlog and userlog[event_type]:
                 event_name = userlog_event_types[event_type]
-                for idx, event in enumerate(userlog[uid][event_type]):
+                for idx, event in enumerate(userlog[event_type]):
                     issuer = (
                         ""
                         if own
@@ -43,8 +46,8 @@ class ModUserlog(Cog):
                         inline=False,
                     )
 
-        if not own and "watch" in userlog[uid]:
-            watch_state = "" if userlog[uid]["watch"] else "NOT "
+        if not own and "watch" in userlog:
+            watch_state = "" if userlog["watch"] else "NOT "
             embed.set_footer(text=f"User is {watch_state}under watch.")
 
         if not embed.fields:
@@ -53,28 +56,28 @@ class ModUserlog(Cog):
         return embed
 
     def clear_event_from_id(self, uid: str, event_type):
-        userlog = get_userlog()
-        if uid not in userlog:
+        userlog = get_user_userlog(uid)
+        if userlog is None:
             return f"<@{uid}> has no {event_type}!"
-        event_count = len(userlog[uid][event_type])
+        event_count = len(userlog[event_type])
         if not event_count:
             return f"<@{uid}> has no {event_type}!"
-        userlog[uid][event_type] = []
-        set_userlog(json.dumps(userlog))
+        userlog[event_type] = []
+        save_user_userlog(uid)
         return f"<@{uid}> no longer has any {event_type}!"
 
     def delete_event_from_id(self, uid: str, idx: int, event_type):
-        userlog = get_userlog()
-        if uid not in userlog:
+        userlog = get_user_userlog(uid)
+        if userlog is None:
             return f"<@{uid}> has no {event_type}!"
-        event_count = len(userlog[uid][event_type])
+        event_count = len(userlog[event_type])
         if not event_count:
             return f"<@{uid}> has no {event_type}!"
         if idx > event_count:
             return "Index is higher than " f"count ({event_count})!"
         if idx < 1:
             return "Index is below 1!"
-        event = userlog[uid][event_type][idx - 1]
+        event = userlog[event_type][idx - 1]
         event_name = userlog_event_types[event_type]
         embed = discord.Embed(
             color=discord.Color.dark_red(),
@@ -82,8 +85,8 @@ class ModUserlog(Cog):
             description=f"Issuer: {event['issuer_name']}\n"
             f"Reason: {event['reason']}",
         )
-        del userlog[uid][event_type][idx - 1]
-        set_userlog(json.dumps(userlog))
+        del userlog[event_type][idx - 1]
+        save_user_userlog(uid)
         return embed
 
     @commands.guild_only()
@@ -1,13 +1,18 @@
+import asyncio
 import config
+from collections import deque
 from discord.ext import commands
 from discord.ext.commands import Cog
 from discord.enums import MessageType
 from discord import Embed
-import aiohttp
-import gidgethub.aiohttp
 from helpers.checks import check_if_collaborator
+from helpers.http import request
 from helpers.checks import check_if_pin_channel
 
+gists_url = "https://api.github.com/gists"
+# Longest wait in seconds between retries of a failed pinboard write
+pinboard_max_backoff = 15 * 60
+
 
 class Pin(Cog):
     """
@@ -16,6 +21,13 @@ class Pin(Cog):
 
     def __init__(self, bot):
         self.bot = bot
+        # Pinboard gist id, content and ETag by channel id, with pins not yet written
+        self.pinboards = {}
+        self.pinboard_lock = asyncio.Lock()
+        # Pinned messages by channel id, newest first like channel.pins()
+        self.pins = {}
+        # Pin updates we caused and will get an event for, by channel id
+        self.expected_pin_updates = {}
 
     def is_pinboard(self, msg):
         return (
@@ -24,20 +36,82 @@ class Pin(Cog):
             and msg.embeds[0].title == "Pinboard"
         )
 
-    async def get_pinboard(self, gh, channel):
+    async def get_pins(self, channel):
+        if channel.id not in self.pins:
+            self.pins[channel.id] = deque(await channel.pins())
+        return self.pins[channel.id]
+
+    def oldest_pin(self, pins):
+        # There's only one pinboard, so this looks at two pins at most
+        return next((msg for msg in reversed(pins) if not self.is_pinboard(msg)), None)
+
+    async def pin_message(self, msg):
+        pins = await self.get_pins(msg.channel)
+        await self.change_pin(msg, msg.pin)
+        pins.appendleft(msg)
+
+    async def unpin_message(self, msg):
+        pins = await self.get_pins(msg.channel)
+        await self.change_pin(msg, msg.unpin)
+        if msg in pins:
+            pins.remove(msg)
+
+    async def change_pin(self, msg, action):
+        # Counted beforehand, the pins update event can come before the response
+        channel_id = msg.channel.id
+        self.expected_pin_updates[channel_id] = (
+            self.expected_pin_updates.get(channel_id, 0) + 1
+        )
+        try:
+            await action()
+        except:
+            self.expected_pin_updates[channel_id] -= 1
+            raise
+
+    def github_headers(self, etag=None):
+        headers = {
+            "Accept": "application/vnd.github.v3+json",
+            "Authorization": f"token {config.github_oauth_token}",
+        }
+        if etag:
+            headers["If-Match"] = etag
+        return headers
+
+    async def github_request(self, method, url, **kwargs):
+        """Sends a GitHub API request, returning the response status, ETag and JSON."""
+        async with await request(method, url, **kwargs) as response:
+            if response.status == 412:
+                return response.status, None, None
+            response.raise_for_status()
+            return response.status, response.headers.get("ETag"), await response.json()
+
+    async def get_pinboard(self, channel):
+        """Returns the cached pinboard of a channel, loading it on first use."""
+        async with self.pinboard_lock:
+            if channel.id not in self.pinboards:
+                self.pinboards[channel.id] = await self.load_pinboard(channel)
+        return self.pinboards[channel.id]
+
+    async def load_pinboard(self, channel):
         # Find pinboard pin
-        pinboard_msg = None
-        for msg in reversed(await channel.pins()):
+        for msg in reversed(await self.get_pins(channel)):
             if self.is_pinboard(msg):
-                # Found pinboard, return content and gist id
-                id = msg.embeds[0].url.split("/")[-1]
-                data = await gh.getitem(f"/gists/{id}")
-                return (id, data["files"]["pinboard.md"]["content"])
+                # Found pinboard, fetch its content
+                pinboard = {
+                    "id": msg.embeds[0].url.split("/")[-1],
+                    "pending": [],
+                    "flush_task": None,
+                    "writing": False,
+                }
+                await self.refresh_pinboard(pinboard)
+                return pinboard
 
         # Create pinboard pin if it does not exist
-        data = await gh.post(
-            "/gists",
-            data={
+        _, etag, data = await self.github_request(
+            "POST",
+            gists_url,
+            headers=self.github_headers(),
+            json={
                 "files": {
                     "pinboard.md": {"content": "Old pins are available here:\n\n"}
                 },
@@ -54,25 +128,101 @@ class Pin(Cog):
                 url=data["html_url"],
             )
         )
-        await msg.pin()
+        await self.pin_message(msg)
 
-        return (data["id"], data["files"]["pinboard.md"]["content"])
+        return {
+            "id": data["id"],
+            "content": data["files"]["pinboard.md"]["content"],
+            "etag": etag,
+            "pending": [],
+            "flush_task": None,
+            "writing": False,
+        }
+
+    async def refresh_pinboard(self, pinboard):
+        _, etag, data = await self.github_request(
+            "GET", f"{gists_url}/{pinboard['id']}", headers=self.github_headers()
+        )
+        pinboard["content"] = data["files"]["pinboard.md"]["content"]
+        pinboard["etag"] = etag
 
     async def add_pin_to_pinboard(self, channel, data):
         if config.github_oauth_token == "":
             # Don't add to gist pinboard if we don't have an oauth token
             return
 
-        async with aiohttp.ClientSession() as session:
-            gh = gidgethub.aiohttp.GitHubAPI(
-                session, "RoboCop-NG", oauth_token=config.github_oauth_token
+        pinboard = await self.get_pinboard(channel)
+        pinboard["pending"].append("- " + data + "\n")
+        # Pins arriving before the write goes out are sent along with it
+        if pinboard["flush_task"] is None:
+            pinboard["flush_task"] = self.bot.loop.create_task(
+                self.flush_pinboard(pinboard)
+            )
+
+    def flush_pinboard_now(self, pinboard):
+        """Cuts the wait before a pinboard write short, returns the write task."""
+        if pinboard["flush_task"] is not None and not pinboard["writing"]:
+            pinboard["flush_task"].cancel()
+            pinboard["flush_task"] = None
+        if pinboard["pending"] and pinboard["flush_task"] is None:
+            pinboard["flush_task"] = self.bot.loop.create_task(
+                self.flush_pinboard(pinboard, 0)
             )
-            (id, content) = await self.get_pinboard(gh, channel)
-            content += "- " + data + "\n"
+        return pinboard["flush_task"]
+
+    async def flush_pinboards(self):
+        """Writes every pending pin right away, before the bot shuts down."""
+        tasks = [
+            self.flush_pinboard_now(pinboard) for pinboard in self.pinboards.values()
+        ]
+        await asyncio.gather(*(task for task in tasks if task), return_exceptions=True)
+
+    def cog_unload(self):
+        # Pending pins are already gone from the channel, don't wait to write them
+        for pinboard in self.pinboards.values():
+            self.flush_pinboard_now(pinboard)
 
-            await gh.patch(
-                f"/gists/{id}", data={"files": {"pinboard.md": {"content": content}}}
+    async def flush_pinboard(self, pinboard, delay=None, backoff=None):
+        await asyncio.sleep(config.pinboard_flush_delay if delay is None else delay)
+        pinboard["writing"] = True
+        lines = pinboard["pending"]
+        pinboard["pending"] = []
+        retry_backoff = None
+
+        try:
+            # Only write over the version we know, refetch if it changed on GitHub
+            for attempt in range(3):
+                content = pinboard["content"] + "".join(lines)
+                status, etag, data = await self.github_request(
+                    "PATCH",
+                    f"{gists_url}/{pinboard['id']}",
+                    headers=self.github_headers(pinboard["etag"]),
+                    json={"files": {"pinboard.md": {"content": content}}},
+                )
+                if status != 412:
+                    pinboard["content"] = data["files"]["pinboard.md"]["content"]
+                    pinboard["etag"] = etag
+                    return
+                await self.refresh_pinboard(pinboard)
+            raise RuntimeError("Pinboard gist kept changing while writing to it")
+        except Exception as error:
+            # Keep the lines and try again later, waiting longer after each failure
+            pinboard["pending"] = lines + pinboard["pending"]
+            retry_backoff = min(
+                (backoff or config.pinboard_flush_delay) * 2, pinboard_max_backoff
+            )
+            self.bot.log.error(
+                f"Failed to update pinboard gist {pinboard['id']}, "
+                f"retrying in {retry_backoff}s: {error}"
             )
+        finally:
+            pinboard["writing"] = False
+            pinboard["flush_task"] = None
+            # Failed lines and pins that came in during the write go out next
+            if pinboard["pending"]:
+                pinboard["flush_task"] = self.bot.loop.create_task(
+                    self.flush_pinboard(pinboard, retry_backoff, retry_backoff)
+                )
 
     @commands.command()
     @commands.guild_only()
@@ -82,18 +232,26 @@ class Pin(Cog):
         """Unpins a pinned message."""
         if idx <= 50:
             # Get message by pin idx
-            target_msg = (await ctx.message.channel.pins())[idx]
+            target_msg = (await self.get_pins(ctx.message.channel))[idx]
         else:
             # Get message by ID
             target_msg = await ctx.message.channel.get_message(idx)
         if self.is_pinboard(target_msg):
             await ctx.send("Cannot unpin pinboard!")
         else:
-            await target_msg.unpin()
+            await self.unpin_message(target_msg)
             await target_msg.remove_reaction("📌", self.bot.user)
             await ctx.send(f"Unpinned {target_msg.jump_url}")
             # TODO: Remove from pinboard?
 
+    @Cog.listener()
+    async def on_guild_channel_pins_update(self, channel, last_pin):
+        if self.expected_pin_updates.get(channel.id):
+            self.expected_pin_updates[channel.id] -= 1
+        else:
+            # Someone else pinned or unpinned, fetch the pins again on next use
+            self.pins.pop(channel.id, None)
+
     # Use raw_reaction to allow pinning old messages.
     @Cog.listener()
     async def on_raw_reaction_add(self, payload):
@@ -132,18 +290,15 @@ class Pin(Cog):
                 if not target_msg.pinned:
                     # If we already have 50 pins, we should unpin the oldest.
                     # We should avoid unpinning the pinboard.
-                    pins = await target_chan.pins()
+                    pins = await self.get_pins(target_chan)
                     if len(pins) >= 50:
-                        for msg in reversed(pins):
-                            if not self.is_pinboard(msg):
-                                await msg.unpin()
-                                break
+                        await self.unpin_message(self.oldest_pin(pins))
 
                     # Wait for the automated "Pinned" message so we can delete it
                     waitable = self.bot.wait_for("message", check=check)
 
                     # Pin the message
-                    await target_msg.pin()
+                    await self.pin_message(target_msg)
 
                     # Delete the automated Pinned message
                     msg = await waitable
@@ -1,23 +1,60 @@
 import asyncio
 import config
+import heapq
 import time
 import discord
 import traceback
+from functools import partial
 from discord.ext import commands
 from discord.ext.commands import Cog
-from helpers.robocronp import get_crontab, delete_job
+from helpers.robocronp import (
+    get_crontab,
+    delete_job,
+    delete_jobs,
+    job_added_listeners,
+)
 from helpers.restrictions import remove_restriction
+from helpers.bulk import channel_bucket, run_bulk
 from helpers.checks import check_if_staff
+from helpers.storage import get_storage
+
+# Seconds to wait before trying jobs again after the scheduler errored
+job_retry_delay = 60
 
 
 class Robocronp(Cog):
     def __init__(self, bot):
         self.bot = bot
+        # Min-heap of (timestamp, timestamp string, job type, job name)
+        self.job_heap = []
+        # Jobs that already ran but couldn't be deleted from the crontab yet
+        self.finished_jobs = []
+        self.job_added = asyncio.Event()
+        for jobtype, timestamps in get_crontab().items():
+            for jobtimestamp, jobs in timestamps.items():
+                for job_name in jobs:
+                    self.push_job(jobtimestamp, jobtype, job_name)
+        job_added_listeners.append(self.on_job_added)
+        self.scheduler_task = bot.loop.create_task(self.run_jobs())
         bot.loop.create_task(self.minutely())
         bot.loop.create_task(self.hourly())
         bot.loop.create_task(self.daily())
 
+    def cog_unload(self):
+        job_added_listeners.remove(self.on_job_added)
+        self.scheduler_task.cancel()
+
+    def push_job(self, timestamp, job_type, job_name):
+        heapq.heappush(self.job_heap, (int(timestamp), timestamp, job_type, job_name))
+
+    def on_job_added(self, timestamp, job_type, job_name):
+        self.push_job(timestamp, job_type, job_name)
+        # Only wake the scheduler if this is the new earliest job
+        if self.job_heap[0][0] == int(timestamp):
+            self.job_added.set()
+
     async def send_data(self):
+        get_storage().export_jsons()
         data_files = [discord.File(fpath) for fpath in self.bot.wanted_jsons]
         log_channel = self.bot.get_channel(config.botlog_channel)
         await log_channel.send("Hourly data backups:", files=data_files)
@@ -52,46 +89,105 @@ class Robocronp(Cog):
         - job name (userid, like 420332322307571713)
 
         You can get all 3 from listjobs command."""
+        # The heap entry is left in place, do_due_jobs skips jobs that are no
+        # longer in the crontab when they come due
         delete_job(timestamp, job_type, job_name)
         await ctx.send(f"{ctx.author.mention}: Deleted!")
 
-    async def do_jobs(self, ctab, jobtype, timestamp):
+    async def do_job(self, jobtype, job_name, job_details):
         log_channel = self.bot.get_channel(config.botlog_channel)
-        for job_name in ctab[jobtype][timestamp]:
-            try:
-                job_details = ctab[jobtype][timestamp][job_name]
-                if jobtype == "unban":
-                    target_user = await self.bot.fetch_user(job_name)
-                    target_guild = self.bot.get_guild(job_details["guild"])
-                    delete_job(timestamp, jobtype, job_name)
-                    await target_guild.unban(
-                        target_user, reason="Robocronp: Timed ban expired."
-                    )
-                elif jobtype == "unmute":
-                    remove_restriction(job_name, config.mute_role)
-                    target_guild = self.bot.get_guild(job_details["guild"])
-                    target_member = target_guild.get_member(int(job_name))
-                    target_role = target_guild.get_role(config.mute_role)
-                    await target_member.remove_roles(
-                        target_role, reason="Robocronp: Timed mute expired."
+        try:
+            if jobtype == "unban":
+                target_user = await self.bot.fetch_user(job_name)
+                target_guild = self.bot.get_guild(job_details["guild"])
+                await target_guild.unban(
+                    target_user, reason="Robocronp: Timed ban expired."
+                )
+            elif jobtype == "unmute":
+                remove_restriction(job_name, config.mute_role)
+                target_guild = self.bot.get_guild(job_details["guild"])
+                target_member = target_guild.get_member(int(job_name))
+                target_role = target_guild.get_role(config.mute_role)
+                await target_member.remove_roles(
+                    target_role, reason="Robocronp: Timed mute expired."
+                )
+            elif jobtype == "remind":
+                text = job_details["text"]
+                added_on = job_details["added"]
+                target = await self.bot.fetch_user(int(job_name))
+                if target:
+                    await target.send(
+                        f"You asked to be reminded about `{text}` on {added_on}."
                     )
-                    delete_job(timestamp, jobtype, job_name)
-                elif jobtype == "remind":
-                    text = job_details["text"]
-                    added_on = job_details["added"]
-                    target = await self.bot.fetch_user(int(job_name))
-                    if target:
-                        await target.send(
-                            f"You asked to be reminded about `{text}` on {added_on}."
-                        )
-                    delete_job(timestamp, jobtype, job_name)
+        except:
+            # Don't kill cronjobs if something goes wrong.
+            await log_channel.send(
+                "Crondo has errored, job deleted: ```" f"{traceback.format_exc()}```"
+            )
+
+    async def do_due_jobs(self):
+        if self.finished_jobs:
+            delete_jobs(self.finished_jobs)
+            self.finished_jobs = []
+
+        timestamp = time.time()
+        due_entries = []
+        while self.job_heap and self.job_heap[0][0] <= timestamp:
+            due_entries.append(heapq.heappop(self.job_heap))
+        try:
+            ctab = get_crontab()
+        except:
+            # Nothing ran yet, so keep the jobs queued for the next try
+            for entry in due_entries:
+                heapq.heappush(self.job_heap, entry)
+            raise
+
+        due_jobs = []
+        for _, jobtimestamp, jobtype, job_name in due_entries:
+            # Skip jobs deleted since being queued, and entries queued twice
+            if job_name not in ctab.get(jobtype, {}).get(jobtimestamp, {}):
+                continue
+            job = (jobtimestamp, jobtype, job_name)
+            if job not in due_jobs:
+                due_jobs.append(job)
+
+        if not due_jobs:
+            return
+
+        await asyncio.gather(
+            *[
+                self.do_job(jobtype, job_name, ctab[jobtype][jobtimestamp][job_name])
+                for jobtimestamp, jobtype, job_name in due_jobs
+            ]
+        )
+        # Running them again would repeat unbans and reminders, so if this
+        # fails they're only retried for deletion
+        self.finished_jobs = due_jobs
+        delete_jobs(due_jobs)
+        self.finished_jobs = []
+
+    async def run_jobs(self):
+        await self.bot.wait_until_ready()
+        log_channel = self.bot.get_channel(config.botlog_channel)
+        while not self.bot.is_closed():
+            self.job_added.clear()
+            # Sleep until the earliest job is due, or until an earlier one is added
+            timeout = None
+            if self.job_heap:
+                timeout = max(0, self.job_heap[0][0] - time.time())
+            try:
+                await asyncio.wait_for(self.job_added.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+            try:
+                await self.do_due_jobs()
             except:
                 # Don't kill cronjobs if something goes wrong.
-                delete_job(timestamp, jobtype, job_name)
                 await log_channel.send(
-                    "Crondo has errored, job deleted: ```"
-                    f"{traceback.format_exc()}```"
+                    f"Cron-jobs has errored: ```{traceback.format_exc()}```"
                 )
+                await asyncio.sleep(job_retry_delay)
 
     async def clean_channel(self, channel_id):
         log_channel = self.bot.get_channel(config.botlog_channel)
@@ -113,21 +209,24 @@ class Robocronp(Cog):
                 f"Cronclean has errored: ```{traceback.format_exc()}```"
             )
 
+    async def clean_channels(self, channel_ids):
+        # Purges are rate limited per channel, so the channels are cleaned at once
+        await run_bulk(
+            (
+                channel_bucket("messages", discord.Object(id=channel_id)),
+                channel_id,
+                partial(self.clean_channel, channel_id),
+            )
+            for channel_id in channel_ids
+        )
+
     async def minutely(self):
         await self.bot.wait_until_ready()
         log_channel = self.bot.get_channel(config.botlog_channel)
         while not self.bot.is_closed():
             try:
-                ctab = get_crontab()
-                timestamp = time.time()
-                for jobtype in ctab:
-                    for jobtimestamp in ctab[jobtype]:
-                        if timestamp > int(jobtimestamp):
-                            await self.do_jobs(ctab, jobtype, jobtimestamp)
-
                 # Handle clean channels
-                for clean_channel in config.minutely_clean_channels:
-                    await self.clean_channel(clean_channel)
+                await self.clean_channels(config.minutely_clean_channels)
             except:
                 # Don't kill cronjobs if something goes wrong.
                 await log_channel.send(
@@ -146,8 +245,7 @@ class Robocronp(Cog):
                 await self.send_data()
 
                 # Handle clean channels
-                for clean_channel in config.hourly_clean_channels:
-                    await self.clean_channel(clean_channel)
+                await self.clean_channels(config.hourly_clean_channels)
             except:
                 # Don't kill cronjobs if something goes wrong.
                 await log_channel.send(
@@ -1,9 +1,11 @@
 import json
 import config
 import os
+from functools import partial
 
 import discord
 from discord.ext.commands import Cog
+from helpers.bulk import guild_bucket, run_bulk
 
 
 class RyujinxReactionRoles(Cog):
@@ -60,23 +62,48 @@ class RyujinxReactionRoles(Cog):
 
         return embed
 
-    async def handle_offline_reaction_add(self):
+    async def reconcile_reaction_roles(self):
+        """Gives and takes roles for reactions changed while the bot was offline."""
+        guild = self.m.guild
+        changes = []
         for reaction in self.m.reactions:
-            for user in await reaction.users().flatten():
-                if self.emoji_map.get(reaction.emoji) is not None:
-                    role = self.get_role(reaction.emoji)
-                    if not user in role.members and not user.bot:
-                        await user.add_roles(role)
-                else:
-                    await self.m.clear_reaction(reaction.emoji)
+            if self.emoji_map.get(str(reaction.emoji)) is None:
+                await self.m.clear_reaction(reaction.emoji)
+                continue
+            role = self.get_role(reaction.emoji)
+            if role is None:
+                print(f"Role {self.emoji_map[str(reaction.emoji)]} not found.")
+                continue
+
+            # One pass over the reaction users, the rest is set arithmetic
+            reacted = {user.id async for user in reaction.users() if not user.bot}
+            has_role = {member.id for member in role.members}
+            bucket = guild_bucket("member_roles", guild)
+            for user_id in reacted - has_role:
+                member = guild.get_member(user_id)
+                if member is not None:
+                    changes.append(
+                        (bucket, (member, role), partial(member.add_roles, role))
+                    )
+            for user_id in has_role - reacted:
+                member = guild.get_member(user_id)
+                changes.append(
+                    (bucket, (member, role), partial(member.remove_roles, role))
+                )
+
+        result = await run_bulk(changes)
+        for line in result.describe_errors(
+            lambda change: f"{change[1].name} for {change[0]}"
+        ):
+            print(f"Failed to update reaction role {line}")
 
-    async def handle_offline_reaction_remove(self):
-        for emoji in self.emoji_map:
-            for reaction in self.m.reactions:
-                role = self.get_role(reaction.emoji)
-                for user in role.members:
-                    if user not in await reaction.users().flatten():
-                        await self.m.guild.get_member(user.id).remove_roles(role)
+    async def fetch_reaction_roles_message(self, channel, message_id):
+        if message_id is None:
+            return None
+        try:
+            return await channel.fetch_message(message_id)
+        except discord.NotFound:
+            return None
 
     @Cog.listener()
     async def on_ready(self):
@@ -91,33 +118,36 @@ class RyujinxReactionRoles(Cog):
         with open(self.file, "r") as f:
             id = json.load(f).get("id")
 
-        m = discord.utils.get(await channel.history().flatten(), id=id)
+        m = await self.fetch_reaction_roles_message(channel, id)
         if m is None:
             os.remove(self.file)
 
             embed = await self.generate_embed()
-            self.m = await channel.send(embed=embed)
-            self.msg_id = self.m.id
+            m = await channel.send(embed=embed)
 
             for x in self.emoji_map:
-                await self.m.add_reaction(x)
+                await m.add_reaction(x)
 
             with open(self.file, "w") as f:
-                json.dump({"id": self.m.id}, f)
+                json.dump({"id": m.id}, f)
 
-            await self.handle_offline_reaction_remove()
+            # Fetched again so the reactions are all there
+            self.m = await channel.fetch_message(m.id)
+            self.msg_id = self.m.id
 
         else:
-            self.m = discord.utils.get(await channel.history().flatten(), id=id)
+            self.m = m
             self.msg_id = self.m.id
 
             await self.m.edit(embed=await self.generate_embed())
+            reacted = {
+                str(reaction.emoji) for reaction in self.m.reactions if reaction.me
+            }
             for x in self.emoji_map:
-                if not x in self.m.reactions:
+                if x not in reacted:
                     await self.m.add_reaction(x)
 
-            await self.handle_offline_reaction_add()
-            await self.handle_offline_reaction_remove()
+        await self.reconcile_reaction_roles()
 
     @Cog.listener()
     async def on_raw_reaction_add(self, payload):
@@ -6,7 +6,7 @@ import config
 import random
 from inspect import cleandoc
 import hashlib
-import itertools
+import re
 from helpers.checks import check_if_staff
 
 
@@ -14,6 +14,12 @@ class Verification(Cog):
     def __init__(self, bot):
         self.bot = bot
         self.hash_choice = random.choice(config.welcome_hashes)
+        # Digests of every name variant with every algorithm, by member id
+        self.member_digests = {}
+        self.hex_re = re.compile(r"[0-9a-f]+")
+        self.digest_lengths = {
+            hashlib.new(algo).digest_size * 2 for algo in config.welcome_hashes
+        }
 
         # Export reset channel functions
         self.bot.do_reset = self.do_reset
@@ -67,6 +73,7 @@ class Verification(Cog):
     async def do_resetalgo(self, channel, author, limit: int = 100):
         # randomize hash_choice on reset
         self.hash_choice = random.choice(tuple(config.welcome_hashes))
+        self.member_digests = {}
 
         msg = (
             f"📘 **Reset Algorithm**: {author} reset " f"algorithm in {channel.mention}"
@@ -102,6 +109,45 @@ class Verification(Cog):
 
         await self.do_resetalgo(ctx.channel, ctx.author.mention, limit)
 
+    def get_member_digests(self, member):
+        """Maps the digests of a member's name variants to (algorithm, allowed)."""
+        name_key = (str(member), member.name)
+        cached = self.member_digests.get(member.id)
+        if cached and cached[0] == name_key:
+            return cached[1]
+
+        full_name = str(member)
+        discrim = str(member.discriminator)
+        # Get a list of stuff we'll allow and will consider close
+        allowed_names = [f"@{full_name}", full_name, str(member.id)]
+        close_names = [f"@{member.name}", member.name, discrim, f"#{discrim}"]
+        # Now add the same things but with newlines at the end of them
+        allowed_names += [(an + "\n") for an in allowed_names]
+        close_names += [(cn + "\n") for cn in close_names]
+        allowed_names += [(an + "\r\n") for an in allowed_names]
+        close_names += [(cn + "\r\n") for cn in close_names]
+        # [ ͡° ͜ᔦ ͡°] 𝐖𝐞𝐥𝐜𝐨𝐦𝐞 𝐭𝐨 𝐌𝐚𝐜 𝐎𝐒 𝟗.
+        allowed_names += [(an + "\r") for an in allowed_names]
+        close_names += [(cn + "\r") for cn in close_names]
+
+        # Finally, hash the stuff so that we can access them later :)
+        digests = {}
+        for algo in config.welcome_hashes:
+            for names, allowed in ((close_names, False), (allowed_names, True)):
+                for name in names:
+                    digest = hashlib.new(algo, name.encode("utf-8")).hexdigest()
+                    digests[digest] = (algo, allowed)
+
+        self.member_digests[member.id] = (name_key, digests)
+        return digests
+
+    def hex_tokens(self, text):
+        """Yields every substring of text that is as long as a digest and all hex."""
+        for token in self.hex_re.findall(text):
+            for length in self.digest_lengths:
+                for start in range(len(token) - length + 1):
+                    yield token[start : start + length]
+
     async def process_message(self, message):
         """Big code that makes me want to shoot myself
         Not really a rewrite but more of a port
@@ -136,26 +182,13 @@ class Verification(Cog):
             # Get the role we will give in case of success
             success_role = guild.get_role(config.named_roles["participant"])
 
-            # Get a list of stuff we'll allow and will consider close
-            allowed_names = [f"@{full_name}", full_name, str(member.id)]
-            close_names = [f"@{member.name}", member.name, discrim, f"#{discrim}"]
-            # Now add the same things but with newlines at the end of them
-            allowed_names += [(an + "\n") for an in allowed_names]
-            close_names += [(cn + "\n") for cn in close_names]
-            allowed_names += [(an + "\r\n") for an in allowed_names]
-            close_names += [(cn + "\r\n") for cn in close_names]
-            # [ ͡° ͜ᔦ ͡°] 𝐖𝐞𝐥𝐜𝐨𝐦𝐞 𝐭𝐨 𝐌𝐚𝐜 𝐎𝐒 𝟗.
-            allowed_names += [(an + "\r") for an in allowed_names]
-            close_names += [(cn + "\r") for cn in close_names]
-
-            # Finally, hash the stuff so that we can access them later :)
-            hash_allow = [
-                hashlib.new(self.hash_choice, name.encode("utf-8")).hexdigest()
-                for name in allowed_names
+            digests = self.get_member_digests(member)
+            matches = [
+                digests[token] for token in self.hex_tokens(mcl) if token in digests
             ]
 
             # I'm not even going to attempt to break those into lines jfc
-            if any(allow in mcl for allow in hash_allow):
+            if (self.hash_choice, True) in matches:
                 await member.add_roles(success_role)
                 return await chan.purge(
                     limit=100,
@@ -167,17 +200,15 @@ class Verification(Cog):
                 )
 
             # Detect if the user uses the wrong hash algorithm
-            wrong_hash_algos = list(set(config.welcome_hashes) - {self.hash_choice})
-            for algo in wrong_hash_algos:
-                for name in itertools.chain(allowed_names, close_names):
-                    if hashlib.new(algo, name.encode("utf-8")).hexdigest() in mcl:
-                        log_channel = self.bot.get_channel(config.log_channel)
-                        await log_channel.send(
-                            f"User {message.author.mention} tried verification with algo {algo} instead of {self.hash_choice}."
-                        )
-                        return await chan.send(
-                            f"{message.author.mention} :no_entry: Close, but not quite. Go back and re-read!"
-                        )
+            for algo, _ in matches:
+                if algo != self.hash_choice:
+                    log_channel = self.bot.get_channel(config.log_channel)
+                    await log_channel.send(
+                        f"User {message.author.mention} tried verification with algo {algo} instead of {self.hash_choice}."
+                    )
+                    return await chan.send(
+                        f"{message.author.mention} :no_entry: Close, but not quite. Go back and re-read!"
+                    )
 
             if (
                 full_name in message.content
@@ -217,6 +248,16 @@ class Verification(Cog):
             chan = self.bot.get_channel(after.channel)
             await chan.send("💢 I don't have permission to do this.")
 
+    @Cog.listener()
+    async def on_member_remove(self, member):
+        self.member_digests.pop(member.id, None)
+
+    @Cog.listener()
+    async def on_user_update(self, before, after):
+        # Name changes are also caught in get_member_digests, this frees the memory
+        if str(before) != str(after):
+            self.member_digests.pop(after.id, None)
+
 
 def setup(bot):
     bot.add_cog(Verification(bot))
@@ -1,8 +1,10 @@
 from discord.ext.commands import Cog
 import re
 import config
+from helpers.http import request
 import secrets
 import asyncio
+import time
 import base64
 import hmac
 
@@ -11,13 +13,11 @@ class YubicoOTP(Cog):
     def __init__(self, bot):
         self.bot = bot
         self.otp_re = re.compile("((cc|vv)[cbdefghijklnrtuv]{42})$")
-        self.api_servers = [
-            "https://api.yubico.com",
-            "https://api2.yubico.com",
-            "https://api3.yubico.com",
-            "https://api4.yubico.com",
-            "https://api5.yubico.com",
-        ]
+        self.api_servers = config.yubico_otp_api_servers
+        # Moving average of each server's response time, fastest is asked first
+        self.server_latency = {api_server: 0 for api_server in self.api_servers}
+        # Counted as the response time of a server that failed to answer
+        self.failed_request_latency = 10
         self.reuse_responses = ["BAD_OTP", "REPLAYED_OTP"]
         self.bad_responses = [
             "MISSING_PARAMETER",
@@ -70,6 +70,49 @@ class YubicoOTP(Cog):
         our_signature = self.calc_signature(to_sign.strip("&"))
         return our_signature == yubico_signature
 
+    def record_latency(self, api_server, latency):
+        self.server_latency[api_server] = (
+            0.7 * self.server_latency.get(api_server, 0) + 0.3 * latency
+        )
+
+    async def query_yubico_server(self, api_server, params, nonce):
+        """Returns the response fields of one server, raising if it can't be trusted."""
+        started = time.monotonic()
+        url = f"{api_server}/wsapi/2.0/verify?{params}"
+        try:
+            # Other servers are tried next, so no point retrying this one
+            async with await request("GET", url, retries=0) as resp:
+                if resp.status != 200:
+                    raise ValueError(f"Got HTTP {resp.status}")
+                resptext = await resp.text()
+
+            # Turn the fields to a python dict for easier parsing
+            datafields = resptext.strip().split("\r\n")
+            datafields = {
+                line[: line.index("=")]: line[line.index("=") + 1 :]
+                for line in datafields
+            }
+
+            # Verify nonce
+            if datafields["nonce"] != nonce:
+                raise ValueError("Nonce doesn't match")
+
+            # Verify signature if secret is present
+            if config.yubico_otp_secret and not self.validate_response_signature(
+                datafields
+            ):
+                raise ValueError("Signature doesn't match")
+        except asyncio.CancelledError:
+            # Another server answered first, this one took at least this long
+            self.record_latency(api_server, time.monotonic() - started)
+            raise
+        except Exception:
+            self.record_latency(api_server, self.failed_request_latency)
+            raise
+
+        self.record_latency(api_server, time.monotonic() - started)
+        return datafields
+
     async def validate_yubico_otp(self, otp):
         nonce = secrets.token_hex(15)  # Random number in the valid range
         params = f"id={config.yubico_otp_client_id}&nonce={nonce}&otp={otp}"
@@ -78,43 +121,52 @@ class YubicoOTP(Cog):
         if config.yubico_otp_secret:
             params += "&h=" + self.calc_signature(params)
 
-        for api_server in self.api_servers:
-            url = f"{api_server}/wsapi/2.0/verify?{params}"
-            try:
-                resp = await self.bot.aiosession.get(url)
-                assert resp.status == 200
-            except Exception as ex:
-                self.bot.log.warning(
-                    f"Got {repr(ex)} on {api_server} with otp {otp}."
+        # Ask the fastest server first, and the next one whenever the ones asked
+        # so far fail or take too long. Servers share the nonce, so they won't
+        # count the same request as a replayed OTP.
+        api_servers = sorted(self.api_servers, key=self.server_latency.get)
+        queries = {}
+        try:
+            while api_servers or queries:
+                if api_servers:
+                    api_server = api_servers.pop(0)
+                    query = self.bot.loop.create_task(
+                        self.query_yubico_server(api_server, params, nonce)
+                    )
+                    queries[query] = api_server
+
+                done, _ = await asyncio.wait(
+                    queries,
+                    timeout=config.yubico_otp_hedge_delay if api_servers else None,
+                    return_when=asyncio.FIRST_COMPLETED,
                 )
-                continue
-            resptext = await resp.text()
-
-            # Turn the fields to a python dict for easier parsing
-            datafields = resptext.strip().split("\r\n")
-            datafields = {line[:line.index("=")]: line[line.index("=") + 1:] for line in datafields}
-
-            # Verify nonce
-            assert datafields["nonce"] == nonce
-
-            # Verify signature if secret is present
-            if config.yubico_otp_secret:
-                assert self.validate_response_signature(datafields)
-
-            # If we got a success, then return True
-            if datafields["status"] == "OK":
-                return True
-            elif datafields["status"] in self.reuse_responses:
-                return False
-
-            # If status isn't an expected one, log it
-            self.bot.log.warning(
-                f"Got {repr(datafields)} on {api_server} with otp {otp} and nonce {nonce}"
-            )
-
-            # If we fucked up in a way we can't recover from, just return None
-            if datafields["status"] in self.bad_responses:
-                return None
+                for query in done:
+                    api_server = queries.pop(query)
+                    try:
+                        datafields = query.result()
+                    except Exception as ex:
+                        self.bot.log.warning(
+                            f"Got {repr(ex)} on {api_server} with otp {otp}."
+                        )
+                        continue
+
+                    # If we got a success, then return True
+                    if datafields["status"] == "OK":
+                        return True
+                    elif datafields["status"] in self.reuse_responses:
+                        return False
+
+                    # If status isn't an expected one, log it
+                    self.bot.log.warning(
+                        f"Got {repr(datafields)} on {api_server} with otp {otp} and nonce {nonce}"
+                    )
+
+                    # If we fucked up in a way we can't recover from, just return None
+                    if datafields["status"] in self.bad_responses:
+                        return None
+        finally:
+            for query in queries:
+                query.cancel()
 
         # Return None if we fail to get responses from any server
         return None
@@ -60,6 +60,9 @@ verification_string = "go read the rules, not the code"
 # then user will be kicked and informed
 min_age = datetime.timedelta(minutes=15)
 
+# Seconds to wait for more invite changes before saving them all at once
+invites_save_delay = 10
+
 # The bot will only work in these guilds
 guild_whitelist = [269333940928512010]  # ReSwitched discord
 
@@ -93,6 +96,9 @@ modlog_channel = 542114169244221452  # mod-logs channel in ReSwitched
 spylog_channel = 548304839294189579  # spy channel in ReSwitched
 welcome_channel = 326416669058662401  # newcomers channel in ReSwitched
 
+# How many bans a massban has in flight at once
+massban_concurrency = 5
+
 # These channel entries are used to determine which roles will be given
 # access when we unmute on them
 general_channels = [
@@ -307,6 +313,8 @@ hidden_term_line = ' • When you have finished reading all of the rules, send a
 # == Only if you want to use cogs.pin ==
 # Used for the pinboard. Leave empty if you don't wish for a gist pinboard.
 github_oauth_token = ""
+# Seconds to wait for more pins before writing them all to the gist at once
+pinboard_flush_delay = 10
 
 # Channels and roles where users can pin messages
 allowed_pin_channels = []
@@ -336,3 +344,32 @@ yubico_otp_client_id = 1
 yubico_otp_secret = ""
 # Optional: If you provide a secret, requests will be signed
 # and responses will be verified.
+# Validation servers, the stub in helpers/yubico_stub.py can be used for testing
+yubico_otp_api_servers = [
+    "https://api.yubico.com",
+    "https://api2.yubico.com",
+    "https://api3.yubico.com",
+    "https://api4.yubico.com",
+    "https://api5.yubico.com",
+]
+# Seconds to wait on a server before also asking the next one
+yubico_otp_hedge_delay = 0.5
+
+# Where userlog, restrictions, robocronp jobs and invites are kept.
+# "json" uses the files in data/, "sqlite" uses data/robocop.sqlite3.
+# The first start with "sqlite" imports the existing json files,
+# and backups still send json files exported from the database.
+# You can also run `python3 -m helpers.storage import` (or `export`) manually.
+storage_backend = "json"
+
+# == Only if you want to use cogs.logfilereader ==
+# Logs are parsed in worker processes so big logs don't hold up the bot.
+# How many logs can be parsed at the same time
+log_parser_workers = 2
+# How many more logs can wait for a free worker before users are asked to retry
+log_parser_queue_limit = 8
+# Seconds a log gets to be parsed before it's given up on
+log_parser_timeout = 15
+# How many parsed and timed out logs are kept, so re-uploads of the same log
+# aren't parsed again
+log_cache_size = 64
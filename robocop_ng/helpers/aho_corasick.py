@@ -0,0 +1,46 @@
+from collections import deque
+
+
+class Automaton:
+    """Finds every occurrence of a set of words in a single pass over a text."""
+
+    def __init__(self, words):
+        self.words = list(words)
+        # Node 0 is the root, each node maps a character to the next node
+        self.goto = [{}]
+        self.fail = [0]
+        # Indexes of the words ending at each node, including through fail links
+        self.output = [[]]
+
+        for word_index, word in enumerate(self.words):
+            node = 0
+            for char in word:
+                if char not in self.goto[node]:
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append([])
+                    self.goto[node][char] = len(self.goto) - 1
+                node = self.goto[node][char]
+            self.output[node].append(word_index)
+
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self.goto[node].items():
+                queue.append(child)
+                fail = self.fail[node]
+                while fail and char not in self.goto[fail]:
+                    fail = self.fail[fail]
+                self.fail[child] = self.goto[fail].get(char, 0)
+                self.output[child] = self.output[child] + self.output[self.fail[child]]
+
+    def find_all(self, text):
+        """Yields (start, end, word index) for every match, ordered by end."""
+        node = 0
+        for position, char in enumerate(text):
+            while node and char not in self.goto[node]:
+                node = self.fail[node]
+            node = self.goto[node].get(char, 0)
+            end = position + 1
+            for word_index in self.output[node]:
+                yield end - len(self.words[word_index]), end, word_index
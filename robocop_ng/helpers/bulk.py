@@ -0,0 +1,61 @@
+import asyncio
+import discord
+
+# Requests in flight at once per rate limit bucket. discord.py already waits
+# out the limits, this only stops a big batch from queueing up all at once.
+bucket_concurrency = 5
+
+
+class BulkResult:
+    """Return values and exceptions of a run_bulk batch, by action key."""
+
+    def __init__(self):
+        self.results = {}
+        self.errors = {}
+
+    @property
+    def ok(self):
+        return not self.errors
+
+    def describe_errors(self, name=str):
+        """One line per failed action, name turns a key into something readable."""
+        lines = []
+        for key, error in self.errors.items():
+            if isinstance(error, discord.HTTPException):
+                reason = error.text or error.status
+            else:
+                reason = type(error).__name__
+            lines.append(f"{name(key)}: {reason}")
+        return lines
+
+
+def channel_bucket(route, channel):
+    # Discord rate limits each route separately per channel or guild
+    return (route, "channel", channel.id)
+
+
+def guild_bucket(route, guild):
+    return (route, "guild", guild.id)
+
+
+async def run_bulk(actions, concurrency=bucket_concurrency):
+    """Runs a batch of Discord calls concurrently.
+
+    actions holds (bucket, key, action) tuples, action being a callable that
+    returns an awaitable. Actions in the same bucket run at most concurrency
+    at a time, different buckets don't wait on each other. Failures don't
+    stop the rest of the batch, they're kept in the returned BulkResult."""
+    result = BulkResult()
+    semaphores = {}
+
+    async def run(bucket, key, action):
+        if bucket not in semaphores:
+            semaphores[bucket] = asyncio.Semaphore(concurrency)
+        async with semaphores[bucket]:
+            try:
+                result.results[key] = await action()
+            except Exception as error:
+                result.errors[key] = error
+
+    await asyncio.gather(*(run(*action) for action in actions))
+    return result
@@ -0,0 +1,162 @@
+import asyncio
+import codecs
+import re
+import aiohttp
+
+user_agent = "robocop_ng/1.0"
+# Used for every request unless the caller passes its own timeout
+default_timeout = aiohttp.ClientTimeout(total=30, connect=10)
+# Connection errors, timeouts and 5xx responses are retried this many times
+default_retries = 2
+idempotent_methods = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+# Seconds to wait before the first retry, doubled on each one after that
+retry_backoff = 0.5
+
+# Biggest body read into memory (or to disk) by the helpers below
+max_download_size = 1000 * 1000 * 8
+# Seconds a download may take, and may go without receiving any data
+download_timeout = aiohttp.ClientTimeout(total=60, sock_read=10)
+download_chunk_size = 16 * 1024
+content_range_re = re.compile(r"bytes (\d+)-(\d+)/(\d+|\*)")
+
+# Process-wide session, created on first use so it's bound to the bot's loop
+_session = None
+
+
+def get_session():
+    global _session
+    if _session is None or _session.closed:
+        connector = aiohttp.TCPConnector(
+            limit=100, limit_per_host=10, keepalive_timeout=60, ttl_dns_cache=300
+        )
+        _session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=default_timeout,
+            headers={"User-Agent": user_agent},
+        )
+    return _session
+
+
+async def close_session():
+    if _session is not None and not _session.closed:
+        await _session.close()
+
+
+async def request(method, url, retries=None, **kwargs):
+    """Sends a request with the shared session, retrying with backoff.
+
+    Only idempotent methods are retried unless retries is given, a timed out
+    POST may have gone through already. The response is returned unread,
+    callers read it or release it."""
+    if retries is None:
+        retries = default_retries if method.upper() in idempotent_methods else 0
+    for attempt in range(retries + 1):
+        try:
+            response = await get_session().request(method, url, **kwargs)
+            if response.status < 500 or attempt == retries:
+                return response
+            response.release()
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+            if attempt == retries:
+                raise
+        await asyncio.sleep(retry_backoff * 2**attempt)
+
+
+class DownloadTooLarge(Exception):
+    pass
+
+
+async def iter_limited(read, max_size=max_download_size):
+    """Yields chunks from read(), giving up as soon as there's over max_size bytes."""
+    total = 0
+    while True:
+        chunk = await read(download_chunk_size)
+        if not chunk:
+            return
+        total += len(chunk)
+        if total > max_size:
+            raise DownloadTooLarge(f"Body is bigger than {max_size} bytes")
+        yield chunk
+
+
+def check_content_length(response, max_size=max_download_size):
+    if response.content_length and response.content_length > max_size:
+        raise DownloadTooLarge(
+            f"Body is {response.content_length} bytes, limit is {max_size}"
+        )
+
+
+async def read_limited(response, max_size=max_download_size):
+    check_content_length(response, max_size)
+    body = bytearray()
+    async for chunk in iter_limited(response.content.read, max_size):
+        body += chunk
+    return bytes(body)
+
+
+def decode_head(data):
+    # A character cut in half at the end is dropped, anything else invalid raises
+    return codecs.getincrementaldecoder("utf-8")().decode(data)
+
+
+def decode_tail(data):
+    # Skip continuation bytes of a character that was cut in half at the start
+    start = 0
+    while start < min(len(data), 3) and 0x80 <= data[start] < 0xC0:
+        start += 1
+    return data[start:].decode("utf-8")
+
+
+async def download_head_tail(url, head_size, tail_size, max_size=max_download_size):
+    """Streams the first head_size and last tail_size bytes of a file.
+
+    Returns the two as separately decoded strings. The tail is empty when
+    nothing was skipped between the two, the head then holds the whole file.
+    Servers ignoring the range request are read through with only the last
+    tail_size bytes kept, up to max_size."""
+    headers = {"Range": f"bytes=0-{head_size - 1}, -{tail_size}"}
+    async with await request(
+        "GET", url, headers=headers, timeout=download_timeout
+    ) as response:
+        response.raise_for_status()
+        head = bytearray()
+        tail = bytearray()
+
+        if response.status == 206 and response.content_type == "multipart/byteranges":
+            reader = aiohttp.MultipartReader.from_response(response)
+            head_end = tail_start = -1
+            # Parts come in the requested order, the tail can start at 0 too
+            for buffer in (head, tail):
+                part = await reader.next()
+                if part is None:
+                    break
+                content_range = content_range_re.match(
+                    part.headers.get("Content-Range", "")
+                )
+                start, end = map(int, content_range.groups()[:2])
+                async for chunk in iter_limited(part.read_chunk, max_size):
+                    buffer += chunk
+                if buffer is head:
+                    head_end = end
+                else:
+                    tail_start = start
+            skipped = tail_start - head_end - 1
+            if skipped <= 0:
+                # Ranges can touch or overlap on small files, drop repeated bytes
+                return decode_head(head + tail[-skipped:]), ""
+            return decode_head(head), decode_tail(tail)
+
+        # Whole file (or a single merged range), keep the head and a rolling tail
+        check_content_length(response, max_size)
+        skipped = 0
+        async for chunk in iter_limited(response.content.read, max_size):
+            missing = head_size - len(head)
+            if missing > 0:
+                head += chunk[:missing]
+                chunk = chunk[missing:]
+            tail += chunk
+            skipped += max(0, len(tail) - tail_size)
+            del tail[:-tail_size]
+        if not skipped:
+            return decode_head(head + tail), ""
+        return decode_head(head), decode_tail(tail)
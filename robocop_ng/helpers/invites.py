@@ -0,0 +1,22 @@
+from helpers.storage import get_storage
+
+
+def get_invites():
+    return get_storage().load_invites()
+
+
+def update_invites(changed, deleted=()):
+    get_storage().update_invites(changed, deleted)
+
+
+def add_invite(invite):
+    update_invites(
+        {
+            invite.id: {
+                "uses": 0,
+                "url": invite.url,
+                "max_uses": invite.max_uses,
+                "code": invite.code,
+            }
+        }
+    )
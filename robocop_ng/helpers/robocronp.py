@@ -1,37 +1,34 @@
 import json
 import math
+from helpers.storage import get_storage
+
+# Called with (timestamp, job_type, job_name) whenever a job is added
+job_added_listeners = []
 
 
 def get_crontab():
-    with open("data/robocronptab.json", "r") as f:
-        return json.load(f)
+    return get_storage().load_crontab()
 
 
 def set_crontab(contents):
-    with open("data/robocronptab.json", "w") as f:
-        f.write(contents)
+    get_storage().save_crontab(json.loads(contents))
 
 
 def add_job(job_type, job_name, job_details, timestamp):
     timestamp = str(math.floor(timestamp))
     job_name = str(job_name)
-    ctab = get_crontab()
-
-    if job_type not in ctab:
-        ctab[job_type] = {}
-
-    if timestamp not in ctab[job_type]:
-        ctab[job_type][timestamp] = {}
-
-    ctab[job_type][timestamp][job_name] = job_details
-    set_crontab(json.dumps(ctab))
+    get_storage().add_job(job_type, timestamp, job_name, job_details)
+    for listener in job_added_listeners:
+        listener(timestamp, job_type, job_name)
 
 
 def delete_job(timestamp, job_type, job_name):
-    timestamp = str(timestamp)
-    job_name = str(job_name)
-    ctab = get_crontab()
+    delete_jobs([(timestamp, job_type, job_name)])
 
-    del ctab[job_type][timestamp][job_name]
 
-    set_crontab(json.dumps(ctab))
+def delete_jobs(jobs):
+    jobs = [
+        (str(timestamp), job_type, str(job_name))
+        for timestamp, job_type, job_name in jobs
+    ]
+    get_storage().delete_jobs(jobs)
@@ -0,0 +1,374 @@
+import re
+
+# Bump this when analyse_log's output changes, so cached results are dropped
+analyser_version = 1
+
+# Large files show a header value when not downloaded completely
+# this regex makes sure that the log text to read starts from the first timestamp, ignoring headers
+log_file_header_regex = re.compile(r"\d{2}:\d{2}:\d{2}\.\d{3}.*", re.DOTALL)
+timestamp_regex = re.compile(r"\d{2}:\d{2}:\d{2}\.\d{3}")
+
+# Lines worth a closer look are picked out by a keyword first,
+# then the matching pattern below pulls the value out of them
+hardware_patterns = {
+    "cpu": ("CPU:", re.compile(r"CPU:\s([^;\n\r]*)"), 1),
+    "ram": ("RAM:", re.compile(r"RAM:(\sTotal)?\s([^;\n\r]*)"), 2),
+    "os": ("Operating System:", re.compile(r"Operating System:\s([^;\n\r]*)"), 1),
+    "gpu": (
+        "PrintGpuInformation:",
+        re.compile(r"PrintGpuInformation:\s([^;\n\r]*)"),
+        1,
+    ),
+}
+logs_enabled_regex = re.compile(r"Logs Enabled:\s([^;\n\r]*)")
+game_name_regex = re.compile(r"Loader LoadNca: Application Loaded:\s([^;\n\r]*)")
+mods_regex = re.compile(r"Found mod\s\'(.+?)\'\s(\[.+?\])")
+controllers_regex = re.compile(r"Hid Configure: ([^\r\n]+)")
+ram_available_regex = re.compile(r"Available\s(\d+)(?=\sMB)")
+
+setting_map = {
+    "anisotropic_filtering": "MaxAnisotropy",
+    "aspect_ratio": "AspectRatio",
+    "audio_backend": "AudioBackend",
+    "docked": "EnableDockedMode",
+    "expand_ram": "ExpandRam",
+    "ignore_missing_services": "IgnoreMissingServices",
+    "memory_manager": "MemoryManagerMode",
+    "pptc": "EnablePtc",
+    "resolution_scale": "ResScale",
+    "shader_cache": "EnableShaderCache",
+    "vsync": "EnableVsync",
+}
+setting_regex = re.compile(
+    r"LogValueChange: (" + "|".join(setting_map.values()) + r")\s"
+)
+setting_names = {value: name for name, value in setting_map.items()}
+
+resolution_map = {
+    "-1": "Custom",
+    "1": "Native (720p/1080p)",
+    "2": "2x (1440p/2160p)",
+    "3": "3x (2160p/3240p)",
+    "4": "4x (2880p/4320p)",
+}
+anisotropic_map = {
+    "-1": "Auto",
+    "2": "2x",
+    "4": "4x",
+    "8": "8x",
+    "16": "16x",
+}
+aspect_map = {
+    "Fixed4x3": "4:3",
+    "Fixed16x9": "16:9",
+    "Fixed16x10": "16:10",
+    "Fixed21x9": "21:9",
+    "Fixed32x9": "32:9",
+    "Stretched": "Stretch to Fit Window",
+}
+
+# Known issues found anywhere in an error block, and the note they add
+error_notes = {
+    "shader_cache_collision": (
+        ["Cache collision found"],
+        "⚠️ Cache collision detected. Investigate possible shader cache issues",
+    ),
+    "shader_cache_corruption": (
+        [
+            "Ryujinx.Graphics.Gpu.Shader.ShaderCache.Initialize()",
+            "System.IO.InvalidDataException: End of Central Directory record could not be found",
+            "ICSharpCode.SharpZipLib.Zip.ZipException: Cannot find central directory",
+        ],
+        "⚠️ Cache corruption detected. Investigate possible shader cache issues",
+    ),
+    "dump_hash_warning": (
+        [
+            "ResultFsInvalidIvfcHash",
+            "ResultFsNonRealDataVerificationFailed",
+        ],
+        "⚠️ Dump error detected. Investigate possible bad game/firmware dump issues",
+    ),
+    "update_keys_error": (
+        ["LibHac.MissingKeyException"],
+        "⚠️ Keys or firmware out of date, consider updating them",
+    ),
+    "file_permissions_error": (
+        ["ResultFsPermissionDenied"],
+        "⚠️ File permission error. Consider deleting save directory and allowing Ryujinx to make a new one",
+    ),
+    "file_not_found_error": (
+        ["ResultFsTargetNotFound"],
+        "⚠️ Save not found error. Consider starting game without a save file or using a new save file",
+    ),
+}
+error_terms = {
+    term: error_name for error_name, (terms, _) in error_notes.items() for term in terms
+}
+error_terms_regex = re.compile("|".join(re.escape(term) for term in error_terms))
+
+mainline_version = re.compile(r"^\d\.\d\.\d+$")
+old_mainline_version = re.compile(r"^\d\.\d\.(\d){4}$")
+pr_version = re.compile(r"^\d\.\d\.\d\+([a-f]|\d){7}$")
+ldn_version = re.compile(r"^\d\.\d\.\d\-ldn\d\.\d$")
+
+
+def format_setting(name, setting_value):
+    if name == "docked":
+        return f"{'Docked' if setting_value == 'True' else 'Handheld'}"
+    if name == "resolution_scale":
+        return resolution_map[setting_value]
+    if name == "anisotropic_filtering":
+        return anisotropic_map[setting_value]
+    if name == "aspect_ratio":
+        return aspect_map[setting_value]
+    if name in ["pptc", "shader_cache", "vsync"]:
+        return f"{'Enabled' if setting_value == 'True' else 'Disabled'}"
+    return setting_value
+
+
+def analyse_log(log_file):
+    """Reads a Ryujinx log once, line by line, and returns what the embed shows.
+
+    Notes are returned unsorted, so notes that depend on where the log was
+    posted can still be added before they're ordered by severity."""
+    log_info = {
+        "hardware_info": {
+            "cpu": "Unknown",
+            "gpu": "Unknown",
+            "ram": "Unknown",
+            "os": "Unknown",
+        },
+        "emu_info": {
+            "ryu_version": "Unknown",
+            "ryu_firmware": "Unknown",
+            "logs_enabled": None,
+        },
+        "game_info": {
+            "game_name": "Unknown",
+            "errors": "No errors found in log",
+            "mods": "No mods found",
+            "notes": [],
+        },
+        "settings": {
+            "audio_backend": "Unknown",
+            "docked": "Unknown",
+            "expand_ram": "Unknown",
+            "ignore_missing_services": "Unknown",
+            "memory_manager": "Unknown",
+            "pptc": "Unknown",
+            "shader_cache": "Unknown",
+            "vsync": "Unknown",
+            "resolution_scale": "Unknown",
+            "anisotropic_filtering": "Unknown",
+            "aspect_ratio": "Unknown",
+        },
+    }
+    hardware_info = log_info["hardware_info"]
+    emu_info = log_info["emu_info"]
+    game_info = log_info["game_info"]
+    settings = log_info["settings"]
+    notes = game_info["notes"]
+
+    log_file = re.search(log_file_header_regex, log_file).group(0)
+
+    found = set()
+    raw_settings = {}
+    last_error_lines = None
+    found_errors = set()
+    mods = []
+    controllers = []
+    ram_available = None
+
+    lines = log_file.splitlines()
+    for line in lines:
+        if line == "":
+            continue
+
+        # Error blocks are an |E| line followed by indented lines
+        if "|E|" in line:
+            last_error_lines = [line]
+            found_errors.update(
+                error_terms[term] for term in error_terms_regex.findall(line)
+            )
+        elif line[0] == " " and last_error_lines is not None:
+            if len(last_error_lines) < 2:
+                last_error_lines.append(line)
+            found_errors.update(
+                error_terms[term] for term in error_terms_regex.findall(line)
+            )
+
+        if "LogValueChange: " in line:
+            match = setting_regex.search(line)
+            if match:
+                raw_settings[setting_names[match.group(1)]] = line.split()[-1]
+
+        for name, (keyword, regex, group) in hardware_patterns.items():
+            if name not in found and keyword in line:
+                match = regex.search(line)
+                if match:
+                    hardware_info[name] = match.group(group).rstrip()
+                    found.add(name)
+
+        if "ryu_version" not in found and "Ryujinx Version:" in line:
+            emu_info["ryu_version"] = line.split()[-1]
+            found.add("ryu_version")
+
+        if "ryu_firmware" not in found and "Firmware Version:" in line:
+            emu_info["ryu_firmware"] = line.split()[-1]
+            found.add("ryu_firmware")
+
+        if "logs_enabled" not in found and "Logs Enabled:" in line:
+            match = logs_enabled_regex.search(line)
+            if match:
+                emu_info["logs_enabled"] = match.group(1).rstrip()
+                found.add("logs_enabled")
+
+        if "game_name" not in found and "Application Loaded:" in line:
+            match = game_name_regex.search(line)
+            if match:
+                game_info["game_name"] = match.group(1).rstrip()
+                found.add("game_name")
+
+        if "Found mod" in line:
+            mods.extend(mods_regex.findall(line))
+
+        if "Hid Configure: " in line:
+            controllers.extend(controllers_regex.findall(line))
+
+        if ram_available is None and "Available" in line:
+            match = ram_available_regex.search(line)
+            if match:
+                ram_available = match.group(1)
+
+    # Some log info may be missing for users that use older versions of Ryujinx,
+    # so those settings are left as "Unknown"
+    for name, setting_value in raw_settings.items():
+        settings[name] = format_setting(name, setting_value)
+
+    # Finds the lastest error denoted by |E| in the log and its first line
+    if last_error_lines:
+        game_info["errors"] = "```{}```".format("\n".join(last_error_lines))
+
+    # Also warns of common issues
+    for error_name, (_, error_note) in error_notes.items():
+        if error_name in found_errors:
+            notes.append(error_note)
+
+    latest_timestamp = next(
+        timestamps[-1]
+        for timestamps in map(timestamp_regex.findall, reversed(lines))
+        if timestamps
+    )
+    notes.append(f"ℹ️ Time elapsed in log: `{latest_timestamp}`")
+
+    if mods:
+        game_info["mods"] = "\n".join(
+            f"ℹ️ {mod} ({'ExeFS' if status == '[E]' else 'RomFS'})"
+            for mod, status in mods
+        )
+
+    if controllers:
+        input_status = [f"ℹ {match}" for match in controllers]
+        # Hid Configure lines can appear multiple times, so converting to dict keys removes duplicate entries,
+        # also maintains the list order
+        input_status = list(dict.fromkeys(input_status))
+        notes.append("\n".join(input_status))
+    # If emulator crashes on startup without game load, there is no need to show controller notification at all
+    elif game_info["game_name"] != "Unknown":
+        notes.append("⚠️ No controller information found")
+
+    if ram_available is not None and int(ram_available) < 8000:
+        notes.append(f"⚠️ Less than 8GB RAM available ({ram_available} MB)")
+
+    if "Darwin" in hardware_info["os"]:
+        notes.append("**❌ macOS is currently unsupported**")
+
+    if "Intel" in hardware_info["gpu"]:
+        if "Darwin" in hardware_info["os"] or "Windows" in hardware_info["os"]:
+            notes.append(
+                "**⚠️ Intel iGPUs are known to have driver issues, consider using a discrete GPU**"
+            )
+
+    if emu_info["logs_enabled"] is not None:
+        default_logs = ["Info", "Warning", "Error", "Guest", "Stub"]
+        user_logs = emu_info["logs_enabled"].rstrip().replace(" ", "").split(",")
+        if "Debug" in user_logs:
+            notes.append(
+                "⚠️ **Debug logs enabled will have a negative impact on performance**"
+            )
+        disabled_logs = set(default_logs).difference(set(user_logs))
+        if disabled_logs:
+            logs_status = [f"⚠️ {log} log is not enabled" for log in disabled_logs]
+            notes.append("\n".join(logs_status))
+        else:
+            notes.append("✅ Default logs enabled")
+
+    if emu_info["ryu_firmware"] == "Unknown":
+        notes.append("**❌ Nintendo Switch firmware not found**")
+
+    if settings["anisotropic_filtering"] != "Auto":
+        notes.append(
+            "⚠️ Anisotropic filtering not set to `Auto` can cause graphical issues"
+        )
+
+    if settings["audio_backend"] == "Dummy":
+        notes.append("⚠️ Dummy audio backend, consider changing to SDL2 or OpenAL")
+
+    if settings["pptc"] == "Disabled":
+        notes.append("🔴 **PPTC cache should be enabled**")
+
+    if settings["shader_cache"] == "Disabled":
+        notes.append("🔴 **Shader cache should be enabled**")
+
+    if settings["expand_ram"] == "True":
+        notes.append("⚠️ `Expand DRAM size to 6GB` should only be enabled for 4K mods")
+
+    if settings["memory_manager"] == "SoftwarePageTable":
+        notes.append(
+            "⚠️ `Software` setting in Memory Manager Mode will give slower performance than the default setting of `Host unchecked`"
+        )
+
+    if settings["ignore_missing_services"] == "True":
+        notes.append("⚠️ `Ignore Missing Services` being enabled can cause instability")
+
+    if settings["vsync"] == "Disabled":
+        notes.append(
+            "⚠️ V-Sync disabled can cause instability like games running faster than intended or longer load times"
+        )
+
+    return log_info
+
+
+def get_version_notes(ryu_version, pr_testing_channel):
+    """Returns the notes about the Ryujinx build, shown in support channels."""
+    notes = []
+    if re.match(pr_version, ryu_version):
+        notes.append(
+            f"**⚠️ PR build logs should be posted in <#{pr_testing_channel}>**"
+        )
+
+    if re.match(old_mainline_version, ryu_version):
+        notes.append(
+            f"**🔴 Old Ryujinx version, please re-download from the Ryujinx website as auto-updates will not work on this version**"
+        )
+
+    if not (
+        re.match(mainline_version, ryu_version)
+        or re.match(old_mainline_version, ryu_version)
+        or re.match(ldn_version, ryu_version)
+        or re.match(pr_version, ryu_version)
+        or re.match("Unknown", ryu_version)
+    ):
+        notes.append("**⚠️ Custom builds are not officially supported**")
+    return notes
+
+
+def severity(log_note_string):
+    symbols = ["❌", "🔴", "⚠️", "ℹ", "✅"]
+    return next(i for i, symbol in enumerate(symbols) if symbol in log_note_string)
+
+
+def order_notes(notes):
+    # Warnings split on the string after the warning symbol for alphabetical ordering
+    # Severity key then orders alphabetically sorted warnings to show most severe first
+    return sorted(sorted(notes, key=lambda x: x.split()[1]), key=severity)
@@ -0,0 +1,447 @@
+import contextlib
+import json
+import os
+import sqlite3
+import sys
+import config
+
+userlog_path = "data/userlog.json"
+# Each line is a full userlog entry for one user, replayed over the snapshot
+userlog_journal_path = "data/userlog.journal"
+# Rewrite the snapshot and truncate the journal after this many lines
+userlog_compact_after = 500
+restrictions_path = "data/restrictions.json"
+crontab_path = "data/robocronptab.json"
+invites_path = "data/invites.json"
+# Rebuilt from the list channels when missing, so it isn't part of backups
+list_index_path = "data/listindex.json"
+sqlite_path = "data/robocop.sqlite3"
+
+sqlite_schema = """
+CREATE TABLE IF NOT EXISTS userlog (
+    uid TEXT PRIMARY KEY,
+    entry TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS restrictions (
+    uid TEXT NOT NULL,
+    role INTEGER NOT NULL,
+    PRIMARY KEY (uid, role)
+);
+CREATE TABLE IF NOT EXISTS crontab (
+    job_type TEXT NOT NULL,
+    timestamp INTEGER NOT NULL,
+    job_name TEXT NOT NULL,
+    details TEXT NOT NULL,
+    PRIMARY KEY (job_type, timestamp, job_name)
+);
+CREATE INDEX IF NOT EXISTS crontab_timestamp ON crontab (timestamp);
+CREATE TABLE IF NOT EXISTS invites (
+    id TEXT PRIMARY KEY,
+    entry TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS list_channels (
+    channel_id INTEGER PRIMARY KEY
+);
+CREATE TABLE IF NOT EXISTS list_items (
+    channel_id INTEGER NOT NULL,
+    message_id INTEGER NOT NULL,
+    content TEXT NOT NULL,
+    PRIMARY KEY (channel_id, message_id)
+);
+"""
+
+
+def read_json(path):
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def write_json(path, contents):
+    # Write next to the file and swap it in, so a crash never leaves half a file
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        f.write(json.dumps(contents))
+    os.replace(tmp_path, path)
+
+
+class JSONStorage:
+    """Keeps every table in its own file in data/, rewritten on change."""
+
+    def __init__(self):
+        self.journal_lines = 0
+
+    def load_userlog(self):
+        userlogs = read_json(userlog_path)
+
+        self.journal_lines = 0
+        if not os.path.exists(userlog_journal_path):
+            return userlogs
+
+        with open(userlog_journal_path, "r") as f:
+            for line in f:
+                try:
+                    uid, entry = json.loads(line)
+                except ValueError:
+                    # Torn write from a crash, everything before it is still good
+                    break
+                userlogs[uid] = entry
+                self.journal_lines += 1
+        return userlogs
+
+    def save_userlog(self, userlogs):
+        write_json(userlog_path, userlogs)
+        with open(userlog_journal_path, "w"):
+            pass
+        self.journal_lines = 0
+
+    def save_userlog_entry(self, userlogs, uid):
+        self.save_userlog_entries(userlogs, [uid])
+
+    def save_userlog_entries(self, userlogs, uids):
+        with open(userlog_journal_path, "a") as f:
+            f.write("".join(json.dumps([uid, userlogs[uid]]) + "\n" for uid in uids))
+        self.journal_lines += len(uids)
+        if self.journal_lines >= userlog_compact_after:
+            self.save_userlog(userlogs)
+
+    def load_restrictions(self):
+        return read_json(restrictions_path)
+
+    def save_restrictions(self, rsts):
+        write_json(restrictions_path, rsts)
+
+    def get_user_restrictions(self, uid):
+        return self.load_restrictions().get(uid, [])
+
+    def add_restriction(self, uid, rst):
+        rsts = self.load_restrictions()
+        if uid not in rsts:
+            rsts[uid] = []
+        if rst not in rsts[uid]:
+            rsts[uid].append(rst)
+        self.save_restrictions(rsts)
+
+    def remove_restriction(self, uid, rst):
+        rsts = self.load_restrictions()
+        if uid not in rsts:
+            rsts[uid] = []
+        if rst in rsts[uid]:
+            rsts[uid].remove(rst)
+        self.save_restrictions(rsts)
+
+    def load_crontab(self):
+        return read_json(crontab_path)
+
+    def save_crontab(self, ctab):
+        write_json(crontab_path, ctab)
+
+    def add_job(self, job_type, timestamp, job_name, job_details):
+        ctab = self.load_crontab()
+        if job_type not in ctab:
+            ctab[job_type] = {}
+        if timestamp not in ctab[job_type]:
+            ctab[job_type][timestamp] = {}
+        ctab[job_type][timestamp][job_name] = job_details
+        self.save_crontab(ctab)
+
+    def delete_jobs(self, jobs):
+        ctab = self.load_crontab()
+        for timestamp, job_type, job_name in jobs:
+            # Jobs can be deleted by staff while they're running, skip those
+            ctab.get(job_type, {}).get(timestamp, {}).pop(job_name, None)
+        self.save_crontab(ctab)
+
+    def load_invites(self):
+        return read_json(invites_path)
+
+    def save_invites(self, invites):
+        write_json(invites_path, invites)
+
+    def update_invites(self, changed, deleted=()):
+        invites = self.load_invites()
+        invites.update(changed)
+        for invite_id in deleted:
+            invites.pop(invite_id, None)
+        self.save_invites(invites)
+
+    def load_list_indexes(self):
+        if not os.path.exists(list_index_path):
+            return {}
+        return read_json(list_index_path)
+
+    def load_list_index(self, channel_id):
+        """Returns the [message id, content] items of a list channel, oldest
+        first, or None if it was never indexed."""
+        return self.load_list_indexes().get(str(channel_id))
+
+    def save_list_index(self, channel_id, items):
+        indexes = self.load_list_indexes()
+        indexes[str(channel_id)] = [list(item) for item in items]
+        write_json(list_index_path, indexes)
+
+    def update_list_item(self, channel_id, message_id, content):
+        """Sets the content of a list item, None removes it."""
+        items = [
+            item
+            for item in self.load_list_index(channel_id) or []
+            if item[0] != message_id
+        ]
+        if content is not None:
+            items.append([message_id, content])
+            items.sort()
+        self.save_list_index(channel_id, items)
+
+    def export_jsons(self):
+        # Fold the journal back in so data/userlog.json is complete
+        self.save_userlog(self.load_userlog())
+
+
+class SQLiteStorage:
+    """Keeps every table in a single SQLite database in WAL mode."""
+
+    def __init__(self, path=sqlite_path):
+        is_new = not os.path.exists(path)
+        self.db = sqlite3.connect(path)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(sqlite_schema)
+        self.transaction_depth = 0
+        if is_new:
+            try:
+                self.import_jsons()
+            except:
+                # Leave no half imported database behind, the next start retries
+                self.db.close()
+                for suffix in ("", "-wal", "-shm"):
+                    if os.path.exists(path + suffix):
+                        os.remove(path + suffix)
+                raise
+
+    @contextlib.contextmanager
+    def transaction(self):
+        """Commits when the outermost transaction ends, rolls back on errors."""
+        self.transaction_depth += 1
+        try:
+            if self.transaction_depth == 1:
+                with self.db:
+                    yield
+            else:
+                yield
+        finally:
+            self.transaction_depth -= 1
+
+    def load_userlog(self):
+        rows = self.db.execute("SELECT uid, entry FROM userlog")
+        return {uid: json.loads(entry) for uid, entry in rows}
+
+    def save_userlog(self, userlogs):
+        with self.transaction():
+            self.db.execute("DELETE FROM userlog")
+            self.db.executemany(
+                "INSERT INTO userlog (uid, entry) VALUES (?, ?)",
+                [(uid, json.dumps(entry)) for uid, entry in userlogs.items()],
+            )
+
+    def save_userlog_entry(self, userlogs, uid):
+        self.save_userlog_entries(userlogs, [uid])
+
+    def save_userlog_entries(self, userlogs, uids):
+        with self.transaction():
+            self.db.executemany(
+                "INSERT OR REPLACE INTO userlog (uid, entry) VALUES (?, ?)",
+                [(uid, json.dumps(userlogs[uid])) for uid in uids],
+            )
+
+    def load_restrictions(self):
+        rsts = {}
+        rows = self.db.execute("SELECT uid, role FROM restrictions ORDER BY rowid")
+        for uid, rst in rows:
+            rsts.setdefault(uid, []).append(rst)
+        return rsts
+
+    def save_restrictions(self, rsts):
+        with self.transaction():
+            self.db.execute("DELETE FROM restrictions")
+            self.db.executemany(
+                "INSERT OR IGNORE INTO restrictions (uid, role) VALUES (?, ?)",
+                [(uid, rst) for uid in rsts for rst in rsts[uid]],
+            )
+
+    def get_user_restrictions(self, uid):
+        rows = self.db.execute(
+            "SELECT role FROM restrictions WHERE uid = ? ORDER BY rowid", (uid,)
+        )
+        return [rst for rst, in rows]
+
+    def add_restriction(self, uid, rst):
+        with self.transaction():
+            self.db.execute(
+                "INSERT OR IGNORE INTO restrictions (uid, role) VALUES (?, ?)",
+                (uid, rst),
+            )
+
+    def remove_restriction(self, uid, rst):
+        with self.transaction():
+            self.db.execute(
+                "DELETE FROM restrictions WHERE uid = ? AND role = ?", (uid, rst)
+            )
+
+    def load_crontab(self):
+        ctab = {}
+        rows = self.db.execute(
+            "SELECT job_type, timestamp, job_name, details FROM crontab"
+        )
+        for job_type, timestamp, job_name, details in rows:
+            jobs = ctab.setdefault(job_type, {}).setdefault(str(timestamp), {})
+            jobs[job_name] = json.loads(details)
+        return ctab
+
+    def save_crontab(self, ctab):
+        with self.transaction():
+            self.db.execute("DELETE FROM crontab")
+            self.db.executemany(
+                "INSERT INTO crontab (job_type, timestamp, job_name, details) "
+                "VALUES (?, ?, ?, ?)",
+                [
+                    (job_type, int(timestamp), job_name, json.dumps(details))
+                    for job_type in ctab
+                    for timestamp in ctab[job_type]
+                    for job_name, details in ctab[job_type][timestamp].items()
+                ],
+            )
+
+    def add_job(self, job_type, timestamp, job_name, job_details):
+        with self.transaction():
+            self.db.execute(
+                "INSERT OR REPLACE INTO crontab "
+                "(job_type, timestamp, job_name, details) VALUES (?, ?, ?, ?)",
+                (job_type, int(timestamp), job_name, json.dumps(job_details)),
+            )
+
+    def delete_jobs(self, jobs):
+        with self.transaction():
+            self.db.executemany(
+                "DELETE FROM crontab "
+                "WHERE timestamp = ? AND job_type = ? AND job_name = ?",
+                [
+                    (int(timestamp), job_type, job_name)
+                    for timestamp, job_type, job_name in jobs
+                ],
+            )
+
+    def load_invites(self):
+        rows = self.db.execute("SELECT id, entry FROM invites")
+        return {invite_id: json.loads(entry) for invite_id, entry in rows}
+
+    def save_invites(self, invites):
+        with self.transaction():
+            self.db.execute("DELETE FROM invites")
+            self.db.executemany(
+                "INSERT INTO invites (id, entry) VALUES (?, ?)",
+                [
+                    (invite_id, json.dumps(entry))
+                    for invite_id, entry in invites.items()
+                ],
+            )
+
+    def update_invites(self, changed, deleted=()):
+        with self.transaction():
+            self.db.executemany(
+                "INSERT OR REPLACE INTO invites (id, entry) VALUES (?, ?)",
+                [
+                    (invite_id, json.dumps(entry))
+                    for invite_id, entry in changed.items()
+                ],
+            )
+            self.db.executemany(
+                "DELETE FROM invites WHERE id = ?",
+                [(invite_id,) for invite_id in deleted],
+            )
+
+    def load_list_index(self, channel_id):
+        """Returns the [message id, content] items of a list channel, oldest
+        first, or None if it was never indexed."""
+        indexed = self.db.execute(
+            "SELECT 1 FROM list_channels WHERE channel_id = ?", (channel_id,)
+        ).fetchone()
+        if indexed is None:
+            return None
+        rows = self.db.execute(
+            "SELECT message_id, content FROM list_items "
+            "WHERE channel_id = ? ORDER BY message_id",
+            (channel_id,),
+        )
+        return [[message_id, content] for message_id, content in rows]
+
+    def save_list_index(self, channel_id, items):
+        with self.transaction():
+            self.db.execute(
+                "INSERT OR IGNORE INTO list_channels (channel_id) VALUES (?)",
+                (channel_id,),
+            )
+            self.db.execute(
+                "DELETE FROM list_items WHERE channel_id = ?", (channel_id,)
+            )
+            self.db.executemany(
+                "INSERT INTO list_items (channel_id, message_id, content) "
+                "VALUES (?, ?, ?)",
+                [(channel_id, message_id, content) for message_id, content in items],
+            )
+
+    def update_list_item(self, channel_id, message_id, content):
+        """Sets the content of a list item, None removes it."""
+        with self.transaction():
+            if content is None:
+                self.db.execute(
+                    "DELETE FROM list_items WHERE channel_id = ? AND message_id = ?",
+                    (channel_id, message_id),
+                )
+            else:
+                self.db.execute(
+                    "INSERT OR REPLACE INTO list_items "
+                    "(channel_id, message_id, content) VALUES (?, ?, ?)",
+                    (channel_id, message_id, content),
+                )
+
+    def import_jsons(self):
+        """Replaces the database contents with the data/*.json files."""
+        json_storage = JSONStorage()
+        with self.transaction():
+            self.save_userlog(json_storage.load_userlog())
+            self.save_restrictions(json_storage.load_restrictions())
+            self.save_crontab(json_storage.load_crontab())
+            self.save_invites(json_storage.load_invites())
+
+    def export_jsons(self):
+        """Writes the database contents to the data/*.json files for backups."""
+        json_storage = JSONStorage()
+        json_storage.save_userlog(self.load_userlog())
+        json_storage.save_restrictions(self.load_restrictions())
+        json_storage.save_crontab(self.load_crontab())
+        json_storage.save_invites(self.load_invites())
+
+
+storage_backends = {"json": JSONStorage, "sqlite": SQLiteStorage}
+
+# Process-wide storage, created on first use
+_storage = None
+
+
+def get_storage():
+    global _storage
+    if _storage is None:
+        _storage = storage_backends[config.storage_backend]()
+    return _storage
+
+
+if __name__ == "__main__":
+    # Run from the bot directory: python3 -m helpers.storage import|export
+    if len(sys.argv) != 2 or sys.argv[1] not in ("import", "export"):
+        sys.exit("Usage: python3 -m helpers.storage import|export")
+
+    if sys.argv[1] == "import":
+        SQLiteStorage().import_jsons()
+        print(f"Imported data/*.json into {sqlite_path}.")
+    else:
+        SQLiteStorage().export_jsons()
+        print(f"Exported {sqlite_path} into data/*.json.")
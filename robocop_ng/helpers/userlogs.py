@@ -1,5 +1,6 @@
 import json
 import time
+from helpers.storage import get_storage
 
 userlog_event_types = {
     "warns": "Warn",
@@ -9,15 +10,29 @@ userlog_event_types = {
     "notes": "Note",
 }
 
+# Process-wide userlog, loaded on first use and indexed by user id
+_userlogs = None
+
 
 def get_userlog():
-    with open("data/userlog.json", "r") as f:
-        return json.load(f)
+    global _userlogs
+    if _userlogs is None:
+        _userlogs = get_storage().load_userlog()
+    return _userlogs
+
+
+def get_user_userlog(uid):
+    return get_userlog().get(str(uid))
 
 
 def set_userlog(contents):
-    with open("data/userlog.json", "w") as f:
-        f.write(contents)
+    global _userlogs
+    _userlogs = json.loads(contents)
+    get_storage().save_userlog(_userlogs)
+
+
+def save_user_userlog(uid):
+    get_storage().save_userlog_entry(get_userlog(), str(uid))
 
 
 def fill_userlog(userid, uname):
@@ -39,7 +54,7 @@ def fill_userlog(userid, uname):
     return userlogs, uid
 
 
-def userlog(uid, issuer, reason, event_type, uname: str = ""):
+def add_userlog_event(uid, issuer, reason, event_type, uname):
     userlogs, uid = fill_userlog(uid, uname)
 
     timestamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime())
@@ -52,13 +67,27 @@ def userlog(uid, issuer, reason, event_type, uname: str = ""):
     if event_type not in userlogs[uid]:
         userlogs[uid][event_type] = []
     userlogs[uid][event_type].append(log_data)
-    set_userlog(json.dumps(userlogs))
-    return len(userlogs[uid][event_type])
+    return uid, len(userlogs[uid][event_type])
+
+
+def userlog(uid, issuer, reason, event_type, uname: str = ""):
+    uid, count = add_userlog_event(uid, issuer, reason, event_type, uname)
+    save_user_userlog(uid)
+    return count
+
+
+def userlog_many(targets, issuer, reason, event_type):
+    """Logs the same event for many (uid, uname) pairs, saving them all at once."""
+    uids = [
+        add_userlog_event(uid, issuer, reason, event_type, uname)[0]
+        for uid, uname in targets
+    ]
+    get_storage().save_userlog_entries(get_userlog(), uids)
 
 
 def setwatch(uid, issuer, watch_state, uname: str = ""):
     userlogs, uid = fill_userlog(uid, uname)
 
     userlogs[uid]["watch"] = watch_state
-    set_userlog(json.dumps(userlogs))
+    save_user_userlog(uid)
     return
@@ -0,0 +1,51 @@
+import asyncio
+import base64
+import hmac
+import sys
+import time
+from aiohttp import web
+
+# Run from the bot directory: python3 -m helpers.yubico_stub [port] [status] [delay]
+# then point config.yubico_otp_api_servers at http://127.0.0.1:<port>.
+
+
+def sign(secret, fields):
+    to_sign = "&".join(f"{key}={fields[key]}" for key in sorted(fields))
+    key = base64.b64decode(secret)
+    return base64.b64encode(hmac.digest(key, to_sign.encode(), "SHA1")).decode()
+
+
+def make_app(status="OK", delay=0, secret=""):
+    """Answers every verify request with status after delay seconds."""
+
+    async def verify(request):
+        await asyncio.sleep(delay)
+        fields = {
+            "t": time.strftime("%Y-%m-%dT%H:%M:%SZ0000", time.gmtime()),
+            "otp": request.query.get("otp", ""),
+            "nonce": request.query.get("nonce", ""),
+            "sl": "100",
+            "status": status,
+        }
+        if secret:
+            fields["h"] = sign(secret, fields)
+        return web.Response(
+            text="".join(f"{key}={value}\r\n" for key, value in fields.items())
+        )
+
+    app = web.Application()
+    app.router.add_get("/wsapi/2.0/verify", verify)
+    return app
+
+
+if __name__ == "__main__":
+    import config
+
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8089
+    status = sys.argv[2] if len(sys.argv) > 2 else "OK"
+    delay = float(sys.argv[3]) if len(sys.argv) > 3 else 0
+    web.run_app(
+        make_app(status, delay, config.yubico_otp_secret),
+        host="127.0.0.1",
+        port=port,
+    )